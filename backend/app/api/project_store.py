@@ -0,0 +1,87 @@
+"""
+Project state store shared by API handlers and pipeline worker threads.
+"""
+import threading
+from typing import Dict, List, Optional
+
+
+class ProjectStore:
+    """
+    Thread-safe in-memory store of project records.
+
+    Pipeline threads update progress while async handlers read status, so every
+    write goes through update_fields() under a lock and every read returns a
+    snapshot copy. A status poll therefore never observes a half-updated record.
+    The interface mirrors a key/hash store so it can be backed by Redis or a
+    database without touching the handlers.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._records: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, project_id: str) -> bool:
+        with self._lock:
+            return project_id in self._records
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def get(self, project_id: str) -> Optional[dict]:
+        """
+        Get a snapshot of a project record.
+
+        Args:
+            project_id: Project UUID
+
+        Returns:
+            Copy of the project record, or None if not found
+        """
+        with self._lock:
+            record = self._records.get(project_id)
+            return dict(record) if record is not None else None
+
+    def set(self, project_id: str, record: dict):
+        """
+        Create or replace a project record.
+
+        Args:
+            project_id: Project UUID
+            record: Project record
+        """
+        with self._lock:
+            self._records[project_id] = dict(record)
+
+    def update_fields(self, project_id: str, **fields):
+        """
+        Atomically update one or more fields of a project record.
+
+        Args:
+            project_id: Project UUID
+            **fields: Field names and new values
+        """
+        with self._lock:
+            if project_id in self._records:
+                self._records[project_id].update(fields)
+
+    def delete(self, project_id: str):
+        """
+        Delete a project record if it exists.
+
+        Args:
+            project_id: Project UUID
+        """
+        with self._lock:
+            self._records.pop(project_id, None)
+
+    def values(self) -> List[dict]:
+        """
+        Get snapshots of all project records.
+
+        Returns:
+            List of project record copies
+        """
+        with self._lock:
+            return [dict(record) for record in self._records.values()]
@@ -2,27 +2,56 @@
 FastAPI routes for project and segment management.
 """
 import os
+import re
 import uuid
 import json
 import asyncio
+import time
+import aiofiles
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List
+from urllib.parse import quote
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from shapely.geometry import shape
 import logging
 
-from app.models import ProjectCreate, ProjectResponse, SegmentResponse
+from app.models import ProjectCreate, ProjectResponse, SegmentResponse, SegmentTable
 from app.core.processing_pipeline import ProcessingPipeline
 from app.core.kml_exporter import KMLExporter
+from app.api.project_store import ProjectStore
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 # In-memory storage (replace with database in production)
-projects_db = {}
-segments_db = {}
+projects_db = ProjectStore()
+segments_db = {}  # SegmentTable per project ID
 pipeline_instances = {}  # Store pipeline instances for cancellation
+pipeline_tasks = {}  # Futures of running pipelines, keyed by project ID
+project_shapes = {}  # Search polygons parsed once at creation, keyed by project ID
+
+# Pipelines run on a dedicated thread pool so long-running jobs never occupy
+# the event loop's default executor, which aiofiles and asyncio.to_thread share
+MAX_CONCURRENT_PIPELINES = 4
+pipeline_executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_PIPELINES,
+    thread_name_prefix="pipeline"
+)
+
+# Admission control: at most MAX_CONCURRENT_PIPELINES pipelines are in flight.
+# When all slots are taken, calculate_segments rejects with 429 instead of
+# quietly queueing the job behind the running ones
+pipeline_semaphore = asyncio.Semaphore(MAX_CONCURRENT_PIPELINES)
+
+# Minimum interval between progress writes that don't change the percentage
+PROGRESS_UPDATE_INTERVAL_S = 0.25
+
+# Read size for streaming uploads to disk (1 MiB)
+UPLOAD_CHUNK_SIZE = 1 << 20
 
 
 @router.post("/projects", response_model=ProjectResponse)
@@ -53,6 +82,7 @@ async def create_project(project: ProjectCreate):
             'access_types': project.access_types,
             'access_deviation_m': project.access_deviation_m,
             'grid_spacing_m': project.grid_spacing_m,
+            'max_segment_vertices': project.max_segment_vertices,
             'segment_count': 0,
             'total_area_acres': None,
             'created_at': now,
@@ -60,7 +90,11 @@ async def create_project(project: ProjectCreate):
             'error_message': None
         }
 
-        projects_db[project_id] = project_data
+        projects_db.set(project_id, project_data)
+
+        # Parse the search polygon once; pipeline runs reuse the shapely object.
+        # Kept out of the project record so records stay JSON-serializable
+        project_shapes[project_id] = shape(project.search_polygon)
 
         logger.info(f"Created project {project_id}: {project.name}")
 
@@ -71,6 +105,56 @@ async def create_project(project: ProjectCreate):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _read_json(path: str):
+    """
+    Load a JSON file from disk.
+
+    Blocking - async handlers call this through run_in_threadpool.
+
+    Args:
+        path: Path to JSON file
+
+    Returns:
+        Parsed JSON content
+    """
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+async def _save_upload(upload: UploadFile, path: str):
+    """
+    Stream an uploaded file to disk in fixed-size chunks.
+
+    Keeps memory use bounded by UPLOAD_CHUNK_SIZE instead of the file size,
+    and the disk writes run off the event loop.
+
+    Args:
+        upload: Uploaded file
+        path: Destination path
+    """
+    async with aiofiles.open(path, "wb") as f:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            await f.write(chunk)
+
+
+def _attachment_disposition(filename: str) -> str:
+    """
+    Build a Content-Disposition header for a file download.
+
+    The RFC 5987 filename* parameter carries the UTF-8 name, and filename
+    carries an ASCII fallback with quotes, separators and non-ASCII
+    characters replaced, so any project name yields a valid header.
+
+    Args:
+        filename: Download file name
+
+    Returns:
+        Content-Disposition header value
+    """
+    fallback = re.sub(r'[^\x20-\x7e]|["\\;]', '_', filename)
+    return f"attachment; filename=\"{fallback}\"; filename*=utf-8''{quote(filename, safe='')}"
+
+
 @router.post("/projects/{project_id}/upload-dem")
 async def upload_dem(
     project_id: str,
@@ -96,21 +180,20 @@ async def upload_dem(
         upload_dir = f"/app/data/projects/{project_id}"
         os.makedirs(upload_dir, exist_ok=True)
 
-        # Save DEM file
+        # Save DEM and vegetation files concurrently; both are independent
+        # streams, so one can progress while the other awaits I/O
         dem_path = os.path.join(upload_dir, "dem.tif")
-        with open(dem_path, "wb") as f:
-            content = await dem_file.read()
-            f.write(content)
+        uploads = [_save_upload(dem_file, dem_path)]
+        fields = {'dem_path': dem_path}
 
-        projects_db[project_id]['dem_path'] = dem_path
-
-        # Save vegetation file if provided
         if vegetation_file:
             veg_path = os.path.join(upload_dir, "vegetation.tif")
-            with open(veg_path, "wb") as f:
-                content = await vegetation_file.read()
-                f.write(content)
-            projects_db[project_id]['vegetation_path'] = veg_path
+            uploads.append(_save_upload(vegetation_file, veg_path))
+            fields['vegetation_path'] = veg_path
+
+        await asyncio.gather(*uploads)
+
+        projects_db.update_fields(project_id, **fields)
 
         logger.info(f"Uploaded DEM for project {project_id}")
 
@@ -135,24 +218,50 @@ async def calculate_segments(project_id: str):
     if project_id not in projects_db:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    project = projects_db[project_id]
+    project = projects_db.get(project_id)
 
     if project['status'] == 'processing':
         raise HTTPException(status_code=400, detail="Project is already being processed")
 
-    # Initialize progress tracking BEFORE setting status to 'processing'
-    # This prevents race condition where frontend polls before progress is initialized
-    projects_db[project_id]['progress'] = 0
-    projects_db[project_id]['current_step'] = 'Starting...'
-    projects_db[project_id]['updated_at'] = datetime.now()
+    if pipeline_semaphore.locked():
+        raise HTTPException(
+            status_code=429,
+            detail="Processing capacity reached, please retry later",
+            headers={"Retry-After": "30"}
+        )
+
+    # Not locked, so this returns without waiting
+    await pipeline_semaphore.acquire()
+
+    # Initialize progress tracking in the same atomic update that sets status to
+    # 'processing', so the frontend never polls a processing project without progress
+    projects_db.update_fields(
+        project_id,
+        status='processing',
+        progress=0,
+        current_step='Starting...',
+        updated_at=datetime.now()
+    )
+
+    # Run the blocking pipeline on the pipeline executor, keeping the event loop
+    # free to handle /status requests for progress updates.
+    # Keep a reference to the future so it isn't garbage collected mid-run.
+    loop = asyncio.get_running_loop()
+    try:
+        task = loop.run_in_executor(pipeline_executor, process_project, project_id)
+    except Exception as e:
+        pipeline_semaphore.release()
+        logger.error(f"Failed to start processing for project {project_id}: {e}")
+        projects_db.update_fields(project_id, status='failed', error_message=str(e))
+        raise HTTPException(status_code=503, detail="Failed to start processing")
+
+    pipeline_tasks[project_id] = task
 
-    # Update status
-    projects_db[project_id]['status'] = 'processing'
+    def _on_pipeline_done(_):
+        pipeline_tasks.pop(project_id, None)
+        pipeline_semaphore.release()
 
-    # Start processing in background thread using asyncio.create_task + asyncio.to_thread
-    # This runs the blocking pipeline code in a separate thread, keeping the event loop free
-    # to handle /status requests for progress updates
-    asyncio.create_task(run_process_in_thread(project_id))
+    task.add_done_callback(_on_pipeline_done)
 
     return {
         "message": "Processing started",
@@ -161,19 +270,6 @@ async def calculate_segments(project_id: str):
     }
 
 
-async def run_process_in_thread(project_id: str):
-    """
-    Wrapper to run the blocking process_project function in a background thread.
-
-    This allows the FastAPI event loop to remain responsive to /status requests
-    while the CPU-intensive pipeline processing runs in a separate thread.
-
-    Args:
-        project_id: Project UUID
-    """
-    await asyncio.to_thread(process_project, project_id)
-
-
 def process_project(project_id: str):
     """
     Background task to process a project.
@@ -184,94 +280,107 @@ def process_project(project_id: str):
     Args:
         project_id: Project UUID
     """
-    async def _run_pipeline():
-        """Inner async function to execute the pipeline."""
-        try:
-            project = projects_db[project_id]
-
-            # Build config for pipeline
-            config = {
-                'project_id': project_id,
-                'search_polygon': project['search_polygon'],
-                'drone_agl_altitude': project['drone_agl_altitude'],
-                'preferred_segment_size_acres': project['preferred_segment_size_acres'],
-                'max_vlos_m': project['max_vlos_m'],
-                'access_types': project['access_types'],
-                'access_deviation_m': project['access_deviation_m'],
-                'grid_spacing_m': project['grid_spacing_m'],
-                'dem_path': project.get('dem_path'),
-                'vegetation_path': project.get('vegetation_path'),
-                'roads_path': project.get('roads_path'),
-                'trails_path': project.get('trails_path'),
-                'output_dir': f"/app/data/projects/{project_id}/output"
-            }
-
-            # Create progress callback
-            def update_progress(step: str, progress: int):
-                projects_db[project_id]['current_step'] = step
-                projects_db[project_id]['progress'] = progress
-                projects_db[project_id]['updated_at'] = datetime.now()
-                logger.info(f"Project {project_id} progress: {progress}% - {step}")
-
-            # Execute pipeline
-            pipeline = ProcessingPipeline(config, progress_callback=update_progress)
-
-            # Store pipeline instance for cancellation
-            pipeline_instances[project_id] = pipeline
-
-            results = await pipeline.execute()
-
-            # Remove pipeline instance after completion
-            if project_id in pipeline_instances:
-                del pipeline_instances[project_id]
-
-            if results['success']:
-                # Store segments in memory and persist to disk
-                segments_db[project_id] = results['segments']
-
-                # Save segments to disk for persistence
-                segments_file = f"/app/data/projects/{project_id}/segments.json"
-                try:
-                    with open(segments_file, 'w') as f:
-                        json.dump(results['segments'], f, indent=2)
-                    logger.info(f"Saved segments to {segments_file}")
-                except Exception as e:
-                    logger.error(f"Failed to save segments to disk: {e}")
-
-                # Update project
-                projects_db[project_id]['status'] = 'completed'
-                projects_db[project_id]['segment_count'] = len(results['segments'])
-                projects_db[project_id]['progress'] = 100
-                projects_db[project_id]['current_step'] = 'Complete'
-
-                logger.info(f"Project {project_id} processing completed")
-
-            else:
-                # Check if it was cancelled
-                error_msg = results.get('error', '')
-                if 'Cancelled' in error_msg:
-                    projects_db[project_id]['status'] = 'cancelled'
-                else:
-                    projects_db[project_id]['status'] = 'failed'
-                projects_db[project_id]['error_message'] = error_msg
-                logger.error(f"Project {project_id} processing failed: {error_msg}")
-
-        except Exception as e:
-            # Remove pipeline instance on error
-            if project_id in pipeline_instances:
-                del pipeline_instances[project_id]
-
-            projects_db[project_id]['status'] = 'failed'
-            projects_db[project_id]['error_message'] = str(e)
-            logger.error(f"Error processing project {project_id}: {e}", exc_info=True)
-
-    # Run the async pipeline in this thread's event loop
-    # Since we're in a background thread (via asyncio.to_thread), we can safely
-    # create our own event loop without conflicting with the FastAPI event loop
-    asyncio.run(_run_pipeline())
-
-
-@router.get("/projects/{project_id}/status")
+    try:
+        project = projects_db.get(project_id)
+
+        # Build config for pipeline
+        config = {
+            'project_id': project_id,
+            'search_polygon': project['search_polygon'],
+            'search_polygon_shape': project_shapes.get(project_id),
+            'drone_agl_altitude': project['drone_agl_altitude'],
+            'preferred_segment_size_acres': project['preferred_segment_size_acres'],
+            'max_vlos_m': project['max_vlos_m'],
+            'access_types': project['access_types'],
+            'access_deviation_m': project['access_deviation_m'],
+            'grid_spacing_m': project['grid_spacing_m'],
+            'max_segment_vertices': project.get('max_segment_vertices'),
+            'dem_path': project.get('dem_path'),
+            'vegetation_path': project.get('vegetation_path'),
+            'roads_path': project.get('roads_path'),
+            'trails_path': project.get('trails_path'),
+            'output_dir': f"/app/data/projects/{project_id}/output"
+        }
+
+        # Create progress callback. Per-item ticks (e.g. viewshed counts) are
+        # coalesced: the store is written when the percentage or step changes,
+        # or at most every PROGRESS_UPDATE_INTERVAL_S otherwise
+        last_update = {'time': 0.0, 'progress': None, 'step': None}
+
+        def update_progress(step: str, progress: int):
+            now = time.monotonic()
+            if (progress == last_update['progress']
+                    and step == last_update['step']
+                    and now - last_update['time'] < PROGRESS_UPDATE_INTERVAL_S):
+                return
+
+            last_update['time'] = now
+            last_update['progress'] = progress
+            last_update['step'] = step
+
+            projects_db.update_fields(
+                project_id,
+                current_step=step,
+                progress=progress,
+                updated_at=datetime.now()
+            )
+            logger.info(f"Project {project_id} progress: {progress}% - {step}")
+
+        # Execute pipeline
+        pipeline = ProcessingPipeline(config, progress_callback=update_progress)
+
+        # Store pipeline instance for cancellation
+        pipeline_instances[project_id] = pipeline
+
+        # The pipeline is blocking code, so run it directly in this worker
+        # thread rather than spinning up a new event loop for every job
+        results = pipeline.run()
+
+        # Remove pipeline instance after completion
+        if project_id in pipeline_instances:
+            del pipeline_instances[project_id]
+
+        if results['success']:
+            # Store segments in memory (columnar) and persist to disk
+            segments_db[project_id] = SegmentTable.from_records(results['segments'])
+
+            # Save segments to disk for persistence
+            segments_file = f"/app/data/projects/{project_id}/segments.json"
+            try:
+                with open(segments_file, 'w') as f:
+                    json.dump(results['segments'], f, indent=2)
+                logger.info(f"Saved segments to {segments_file}")
+            except Exception as e:
+                logger.error(f"Failed to save segments to disk: {e}")
+
+            # Update project
+            projects_db.update_fields(
+                project_id,
+                status='completed',
+                segment_count=len(results['segments']),
+                progress=100,
+                current_step='Complete'
+            )
+
+            logger.info(f"Project {project_id} processing completed")
+
+        else:
+            # Check if it was cancelled
+            error_msg = results.get('error', '')
+            status = 'cancelled' if 'Cancelled' in error_msg else 'failed'
+            projects_db.update_fields(project_id, status=status, error_message=error_msg)
+            logger.error(f"Project {project_id} processing failed: {error_msg}")
+
+    except Exception as e:
+        # Remove pipeline instance on error
+        if project_id in pipeline_instances:
+            del pipeline_instances[project_id]
+
+        projects_db.update_fields(project_id, status='failed', error_message=str(e))
+        logger.error(f"Error processing project {project_id}: {e}", exc_info=True)
+
+
+@router.get("/projects/{project_id}/status", response_class=ORJSONResponse)
 async def get_project_status(project_id: str):
     """
     Get processing status for a project.
@@ -285,7 +394,7 @@ async def get_project_status(project_id: str):
     if project_id not in projects_db:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    project = projects_db[project_id]
+    project = projects_db.get(project_id)
 
     status_response = {
         'project_id': project_id,
@@ -315,7 +424,7 @@ async def cancel_project(project_id: str):
     if project_id not in projects_db:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    project = projects_db[project_id]
+    project = projects_db.get(project_id)
 
     # If already completed, cancelled, or failed, just return success
     if project['status'] in ['completed', 'cancelled', 'failed']:
@@ -347,15 +456,14 @@ async def cancel_project(project_id: str):
         # Pipeline might not be in dict yet if processing just started
         # or might have just finished. Mark as cancelled anyway.
         logger.warning(f"Cancel requested for project {project_id} but no active pipeline found")
-        projects_db[project_id]['status'] = 'cancelled'
-        projects_db[project_id]['current_step'] = 'Cancelled'
+        projects_db.update_fields(project_id, status='cancelled', current_step='Cancelled')
         return {
             'message': 'Cancellation marked (pipeline already completed or not started)',
             'project_id': project_id
         }
 
 
-@router.get("/projects/{project_id}", response_model=ProjectResponse)
+@router.get("/projects/{project_id}", response_model=ProjectResponse, response_class=ORJSONResponse)
 async def get_project(project_id: str):
     """
     Get project details.
@@ -369,10 +477,10 @@ async def get_project(project_id: str):
     if project_id not in projects_db:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    return ProjectResponse(**projects_db[project_id])
+    return ProjectResponse(**projects_db.get(project_id))
 
 
-@router.get("/projects/{project_id}/segments")
+@router.get("/projects/{project_id}/segments", response_class=ORJSONResponse)
 async def get_segments(project_id: str):
     """
     Get segments for a project as GeoJSON.
@@ -392,8 +500,8 @@ async def get_segments(project_id: str):
         segments_file = f"/app/data/projects/{project_id}/segments.json"
         if os.path.exists(segments_file):
             try:
-                with open(segments_file, 'r') as f:
-                    segments_db[project_id] = json.load(f)
+                records = await run_in_threadpool(_read_json, segments_file)
+                segments_db[project_id] = SegmentTable.from_records(records)
                 logger.info(f"Loaded segments from disk for project {project_id}")
             except Exception as e:
                 logger.error(f"Failed to load segments from disk: {e}")
@@ -403,27 +511,12 @@ async def get_segments(project_id: str):
 
     segments = segments_db[project_id]
 
-    # Convert to GeoJSON FeatureCollection
-    features = []
-    for segment in segments:
-        feature = {
-            'type': 'Feature',
-            'properties': {
-                'sequence': segment['sequence'],
-                'area_acres': segment['area_acres'],
-                'access_type': segment['access_type'],
-                'launch_point': segment['launch_point']
-            },
-            'geometry': segment['polygon']
-        }
-        features.append(feature)
-
-    geojson = {
-        'type': 'FeatureCollection',
-        'features': features
-    }
+    # Columns are zipped into feature dicts only here, at serialization time.
+    # The response is encoded with orjson, which is much faster than the
+    # stdlib encoder on large collections
+    geojson = segments.to_feature_collection()
 
-    return geojson
+    return ORJSONResponse(geojson)
 
 
 @router.get("/projects/{project_id}/export-kml")
@@ -446,8 +539,8 @@ async def export_kml(project_id: str):
         segments_file = f"/app/data/projects/{project_id}/segments.json"
         if os.path.exists(segments_file):
             try:
-                with open(segments_file, 'r') as f:
-                    segments_db[project_id] = json.load(f)
+                records = await run_in_threadpool(_read_json, segments_file)
+                segments_db[project_id] = SegmentTable.from_records(records)
                 logger.info(f"Loaded segments from disk for KML export of project {project_id}")
             except Exception as e:
                 logger.error(f"Failed to load segments from disk: {e}")
@@ -456,27 +549,26 @@ async def export_kml(project_id: str):
             raise HTTPException(status_code=404, detail="Segments not yet generated")
 
     try:
-        project = projects_db[project_id]
+        project = projects_db.get(project_id)
         segments = segments_db[project_id]
 
-        # Export to KML
+        # Stream the KML as it is generated; nothing is written to disk and
+        # the first bytes reach the client right away. Starlette iterates the
+        # sync generator in its threadpool, off the event loop
         exporter = KMLExporter()
 
-        output_dir = f"/app/exports/{project_id}"
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, f"{project['name']}.kml")
-
-        exporter.export_project(
+        # iter_export converts the records up front, so bad data fails here
+        # before the response starts rather than midway through the stream
+        chunks = exporter.iter_export(
             project['name'],
             project['search_polygon'],
-            segments,
-            output_path
+            segments
         )
 
-        return FileResponse(
-            output_path,
+        return StreamingResponse(
+            chunks,
             media_type='application/vnd.google-earth.kml+xml',
-            filename=f"{project['name']}.kml"
+            headers={'Content-Disposition': _attachment_disposition(f"{project['name']}.kml")}
         )
 
     except Exception as e:
@@ -484,7 +576,7 @@ async def export_kml(project_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/projects")
+@router.get("/projects", response_class=ORJSONResponse)
 async def list_projects():
     """
     List all projects.
@@ -493,7 +585,7 @@ async def list_projects():
         List of projects
     """
     return {
-        'projects': list(projects_db.values()),
+        'projects': projects_db.values(),
         'total': len(projects_db)
     }
 
@@ -512,11 +604,13 @@ async def delete_project(project_id: str):
     if project_id not in projects_db:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    del projects_db[project_id]
+    projects_db.delete(project_id)
 
     if project_id in segments_db:
         del segments_db[project_id]
 
+    project_shapes.pop(project_id, None)
+
     logger.info(f"Deleted project {project_id}")
 
     return {"message": "Project deleted successfully"}
@@ -5,10 +5,12 @@ Access Filter for determining which grid points are accessible based on:
 - Off-road accessibility
 - "Anywhere" (no restrictions)
 """
-from typing import List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Set
+import numpy as np
 import geopandas as gpd
-from shapely.geometry import Point, MultiLineString, LineString
-from shapely.ops import unary_union
+import shapely
+from shapely.geometry import MultiLineString, LineString
+from shapely.geometry.base import BaseGeometry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -38,6 +40,10 @@ class AccessFilter:
         self.roads_gdf = None
         self.trails_gdf = None
 
+        # Unified buffers keyed by (id(gdf), buffer_m), shared between
+        # filter_points() and get_accessible_area()
+        self._buffer_cache: Dict[Tuple[int, float], BaseGeometry] = {}
+
         # Load data if paths provided
         if roads_path:
             self._load_roads()
@@ -113,23 +119,23 @@ class AccessFilter:
         if 'trail' in access_types and self.trails_gdf is not None:
             trail_buffer = self._create_buffer(self.trails_gdf, access_deviation_m)
 
-        # Classify each point
-        primary_points = []
-        secondary_points = []
-
-        for idx, (x, y) in enumerate(points):
-            point = Point(x, y)
-            access_type = self._classify_point(
-                point,
-                access_types,
-                road_buffer,
-                trail_buffer
-            )
+        # Test all points against each buffer in one vectorized GEOS call
+        coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        in_road_buffer = self._points_in_buffer(road_buffer, coords)
+        in_trail_buffer = self._points_in_buffer(trail_buffer, coords)
+
+        # Classify all points at once
+        access = self._classify_points(
+            access_types,
+            in_road_buffer,
+            in_trail_buffer,
+            road_buffer is not None,
+            trail_buffer is not None
+        )
 
-            if access_type:
-                primary_points.append((idx, access_type))
-            else:
-                secondary_points.append((idx, 'none'))
+        accessible = np.not_equal(access, None)
+        primary_points = [(int(idx), access[idx]) for idx in np.flatnonzero(accessible)]
+        secondary_points = [(int(idx), 'none') for idx in np.flatnonzero(~accessible)]
 
         logger.info(
             f"Filtered: {len(primary_points)} primary points, "
@@ -147,63 +153,87 @@ class AccessFilter:
             buffer_m: Buffer distance in meters
 
         Returns:
-            Unified buffer geometry
+            Unified (prepared) buffer geometry
         """
-        # Buffer each geometry
-        buffered = gdf.geometry.buffer(buffer_m)
+        cache_key = (id(gdf), float(buffer_m))
+        cached = self._buffer_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Buffer all geometries in one vectorized call and dissolve them with a
+        # single cascaded union. Buffering the pre-unioned lines is equivalent
+        # but much slower here, since GEOS must node every crossing first
+        geoms = np.asarray(gdf.geometry.values)
+        unified_buffer = shapely.union_all(shapely.buffer(geoms, buffer_m))
+
+        # Prepare once so every point-in-buffer test uses GEOS's indexed
+        # locator instead of walking all buffer vertices
+        shapely.prepare(unified_buffer)
+
+        self._buffer_cache[cache_key] = unified_buffer
+        return unified_buffer
 
-        # Union all buffers
-        unified_buffer = unary_union(buffered.values)
+    @staticmethod
+    def _points_in_buffer(buffer_geom, coords: np.ndarray) -> np.ndarray:
+        """
+        Test which points fall inside a buffer geometry.
 
-        return unified_buffer
+        Args:
+            buffer_geom: Buffer geometry (or None)
+            coords: (N, 2) array of point coordinates
 
-    def _classify_point(
+        Returns:
+            Boolean array, all False if there is no buffer
+        """
+        if buffer_geom is None or len(coords) == 0:
+            return np.zeros(len(coords), dtype=bool)
+
+        return shapely.contains_xy(buffer_geom, coords[:, 0], coords[:, 1])
+
+    def _classify_points(
         self,
-        point: Point,
         access_types: List[str],
-        road_buffer,
-        trail_buffer
-    ) -> Optional[str]:
+        in_road_buffer: np.ndarray,
+        in_trail_buffer: np.ndarray,
+        has_road_buffer: bool,
+        has_trail_buffer: bool
+    ) -> np.ndarray:
         """
-        Classify a point based on access restrictions.
+        Classify points based on access restrictions.
 
         Args:
-            point: Point to classify
             access_types: Requested access types
-            road_buffer: Road buffer geometry (or None)
-            trail_buffer: Trail buffer geometry (or None)
+            in_road_buffer: Boolean array, point is inside the road buffer
+            in_trail_buffer: Boolean array, point is inside the trail buffer
+            has_road_buffer: Whether a road buffer exists
+            has_trail_buffer: Whether a trail buffer exists
 
         Returns:
-            Access type string or None if not accessible
+            Object array of access type strings, None where not accessible
         """
-        in_road_buffer = road_buffer and road_buffer.contains(point)
-        in_trail_buffer = trail_buffer and trail_buffer.contains(point)
+        access = np.full(len(in_road_buffer), None, dtype=object)
 
         # Check based on access_types
         if 'road' in access_types and 'trail' in access_types:
             # Must be in BOTH buffers
-            if in_road_buffer and in_trail_buffer:
-                return 'road_and_trail'
+            access[in_road_buffer & in_trail_buffer] = 'road_and_trail'
             # Or at least one if only one exists
-            elif in_road_buffer and trail_buffer is None:
-                return 'road'
-            elif in_trail_buffer and road_buffer is None:
-                return 'trail'
+            if not has_trail_buffer:
+                access[in_road_buffer] = 'road'
+            elif not has_road_buffer:
+                access[in_trail_buffer] = 'trail'
 
         elif 'road' in access_types:
-            if in_road_buffer:
-                return 'road'
+            access[in_road_buffer] = 'road'
 
         elif 'trail' in access_types:
-            if in_trail_buffer:
-                return 'trail'
+            access[in_trail_buffer] = 'trail'
 
         elif 'off_road' in access_types:
             # Must be outside both buffers
-            if not in_road_buffer and not in_trail_buffer:
-                return 'off_road'
+            access[~in_road_buffer & ~in_trail_buffer] = 'off_road'
 
-        return None
+        return access
 
     def get_accessible_area(
         self,
@@ -230,24 +260,21 @@ class AccessFilter:
         if 'anywhere' in access_types:
             return 100.0
 
-        # Create access area
-        access_area = None
+        # Collect access buffers (shared with filter_points via the buffer cache)
+        buffers = []
 
         if 'road' in access_types and self.roads_gdf is not None:
-            road_buffer = self._create_buffer(self.roads_gdf, access_deviation_m)
-            access_area = road_buffer
+            buffers.append(self._create_buffer(self.roads_gdf, access_deviation_m))
 
         if 'trail' in access_types and self.trails_gdf is not None:
-            trail_buffer = self._create_buffer(self.trails_gdf, access_deviation_m)
-            if access_area:
-                # Union with roads
-                access_area = unary_union([access_area, trail_buffer])
-            else:
-                access_area = trail_buffer
+            buffers.append(self._create_buffer(self.trails_gdf, access_deviation_m))
 
-        if access_area is None:
+        if not buffers:
             return 0.0
 
+        # Single union call; a lone buffer is used as-is
+        access_area = buffers[0] if len(buffers) == 1 else shapely.union_all(buffers)
+
         # Intersect with polygon
         accessible = polygon.intersection(access_area)
 
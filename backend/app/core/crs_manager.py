@@ -4,15 +4,43 @@ CRS (Coordinate Reference System) Manager for handling coordinate transformation
 All processing occurs in a projected CRS (UTM) for correct area & distance calculations.
 """
 import math
+from functools import lru_cache
 from typing import Tuple
+import numpy as np
+import shapely
 from pyproj import CRS, Transformer
 from shapely.geometry import shape, mapping
+from shapely.geometry.base import BaseGeometry
 from shapely.ops import transform
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
+def _get_transformer(from_epsg: int, to_epsg: int) -> Transformer:
+    """
+    Get a cached Transformer between two EPSG codes.
+
+    Building a Transformer makes PROJ parse both CRS definitions and assemble a
+    transformation pipeline, which costs far more than transforming a few
+    coordinates. The same EPSG pairs come up over and over during a run, so
+    transformers are built once per pair. Transformer.transform is thread-safe.
+
+    Args:
+        from_epsg: Source EPSG code
+        to_epsg: Target EPSG code
+
+    Returns:
+        Transformer with always_xy axis order
+    """
+    return Transformer.from_crs(
+        f"EPSG:{from_epsg}",
+        f"EPSG:{to_epsg}",
+        always_xy=True
+    )
+
+
 class CRSManager:
     """Manages coordinate reference system transformations."""
 
@@ -84,19 +112,81 @@ class CRSManager:
         if from_epsg == to_epsg:
             return geojson_geom
 
-        geom = shape(geojson_geom)
+        return mapping(CRSManager.transform_geom(shape(geojson_geom), from_epsg, to_epsg))
+
+    @staticmethod
+    def transform_geom(geom: BaseGeometry, from_epsg: int, to_epsg: int) -> BaseGeometry:
+        """
+        Transform a shapely geometry from one CRS to another.
+
+        Args:
+            geom: Shapely geometry
+            from_epsg: Source EPSG code
+            to_epsg: Target EPSG code
+
+        Returns:
+            Transformed shapely geometry
+        """
+        if from_epsg == to_epsg:
+            return geom
+
+        transformer = _get_transformer(from_epsg, to_epsg)
+
+        return transform(transformer.transform, geom)
+
+    @staticmethod
+    def transform_geoms(geoms: np.ndarray, from_epsg: int, to_epsg: int) -> np.ndarray:
+        """
+        Transform an array of shapely geometries from one CRS to another.
+
+        The coordinates of all geometries go through the cached transformer in
+        a single bulk call.
+
+        Args:
+            geoms: Array of shapely geometries
+            from_epsg: Source EPSG code
+            to_epsg: Target EPSG code
+
+        Returns:
+            Array of transformed shapely geometries, in input order
+        """
+        if from_epsg == to_epsg or len(geoms) == 0:
+            return geoms
+
+        transformer = _get_transformer(from_epsg, to_epsg)
 
-        # Create transformer
-        transformer = Transformer.from_crs(
-            f"EPSG:{from_epsg}",
-            f"EPSG:{to_epsg}",
-            always_xy=True
+        return shapely.transform(
+            geoms,
+            lambda coords: np.column_stack(
+                transformer.transform(coords[:, 0], coords[:, 1])
+            )
         )
 
-        # Transform geometry
-        transformed_geom = transform(transformer.transform, geom)
+    @staticmethod
+    def transform_points(
+        xs: np.ndarray,
+        ys: np.ndarray,
+        from_epsg: int,
+        to_epsg: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Transform arrays of point coordinates from one CRS to another.
 
-        return mapping(transformed_geom)
+        Args:
+            xs: X coordinates
+            ys: Y coordinates
+            from_epsg: Source EPSG code
+            to_epsg: Target EPSG code
+
+        Returns:
+            Tuple of (transformed_xs, transformed_ys) arrays
+        """
+        if from_epsg == to_epsg:
+            return xs, ys
+
+        transformer = _get_transformer(from_epsg, to_epsg)
+
+        return transformer.transform(xs, ys)
 
     @staticmethod
     def get_project_crs(search_polygon_geojson: dict) -> Tuple[int, dict]:
@@ -109,26 +199,33 @@ class CRSManager:
         Returns:
             Tuple of (utm_epsg, transformed_polygon_geojson)
         """
-        # Get centroid
-        lon, lat = CRSManager.get_polygon_centroid(search_polygon_geojson)
+        # Parse once; the centroid, transform and bounds logging all reuse it
+        return CRSManager.get_project_crs_from_shape(shape(search_polygon_geojson))
 
-        # Determine UTM zone
-        utm_epsg = CRSManager.get_utm_epsg(lon, lat)
+    @staticmethod
+    def get_project_crs_from_shape(search_polygon: BaseGeometry) -> Tuple[int, dict]:
+        """
+        Determine the projected CRS for an already-parsed search polygon.
+
+        Same as get_project_crs(), but takes a shapely geometry so callers that
+        parsed the GeoJSON once can skip the shape() call.
+
+        Args:
+            search_polygon: Shapely geometry in WGS84 (EPSG:4326)
+
+        Returns:
+            Tuple of (utm_epsg, transformed_polygon_geojson)
+        """
+        centroid = search_polygon.centroid
+        utm_epsg = CRSManager.get_utm_epsg(centroid.x, centroid.y)
 
         # Transform polygon to UTM
-        projected_polygon = CRSManager.transform_geometry(
-            search_polygon_geojson,
-            from_epsg=4326,
-            to_epsg=utm_epsg
-        )
+        proj_geom = CRSManager.transform_geom(search_polygon, 4326, utm_epsg)
 
-        # Log polygon bounds
-        orig_geom = shape(search_polygon_geojson)
-        proj_geom = shape(projected_polygon)
-        logger.info(f"Original polygon (WGS84) bounds: {orig_geom.bounds}")
+        logger.info(f"Original polygon (WGS84) bounds: {search_polygon.bounds}")
         logger.info(f"Projected polygon (EPSG:{utm_epsg}) bounds: {proj_geom.bounds}")
 
-        return utm_epsg, projected_polygon
+        return utm_epsg, mapping(proj_geom)
 
     @staticmethod
     def transform_point(x: float, y: float, from_epsg: int, to_epsg: int) -> Tuple[float, float]:
@@ -147,11 +244,7 @@ class CRSManager:
         if from_epsg == to_epsg:
             return x, y
 
-        transformer = Transformer.from_crs(
-            f"EPSG:{from_epsg}",
-            f"EPSG:{to_epsg}",
-            always_xy=True
-        )
+        transformer = _get_transformer(from_epsg, to_epsg)
 
         return transformer.transform(x, y)
 
@@ -173,18 +266,7 @@ class CRSManager:
         if epsg == 4326:
             lon, lat = geom.centroid.x, geom.centroid.y
             utm_epsg = CRSManager.get_utm_epsg(lon, lat)
+            geom = CRSManager.transform_geom(geom, epsg, utm_epsg)
 
-            transformer = Transformer.from_crs(
-                f"EPSG:{epsg}",
-                f"EPSG:{utm_epsg}",
-                always_xy=True
-            )
-            geom = transform(transformer.transform, geom)
-
-        # Calculate area in square meters
-        area_m2 = geom.area
-
-        # Convert to acres (1 acre = 4046.86 m²)
-        area_acres = area_m2 / 4046.86
-
-        return area_acres
+        # Calculate area in square meters and convert to acres (1 acre = 4046.86 m²)
+        return geom.area / 4046.86
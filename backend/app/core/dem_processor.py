@@ -9,16 +9,76 @@ Handles:
 """
 import os
 import tempfile
-from typing import Tuple, Optional, Dict
+from functools import lru_cache
+from typing import Tuple, Optional
 import numpy as np
 import rasterio
-from rasterio.mask import mask
+from rasterio.crs import CRS
+from affine import Affine
+from rasterio.errors import WindowError
+from rasterio.features import geometry_mask
+from rasterio.windows import Window, from_bounds, bounds as window_bounds
 from rasterio.warp import calculate_default_transform, reproject, Resampling
-from shapely.geometry import shape, box, mapping
+from shapely.geometry import shape, box
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Every DEM written by the processor is an internally tiled, compressed GeoTIFF
+# so windowed reads only decode the blocks they touch
+GTIFF_BLOCK_SIZE = 512
+OVERVIEW_FACTORS = [2, 4, 8, 16]
+
+# Multithreaded warping for DEM reprojection
+WARP_NUM_THREADS = os.cpu_count() or 1
+WARP_MEM_LIMIT_MB = 512
+WARP_GDAL_ENV = {
+    'GDAL_NUM_THREADS': 'ALL_CPUS',
+    'GDAL_CACHEMAX': 512,
+    'CHECK_DISK_FREE_SPACE': 'NO'
+}
+
+
+@lru_cache(maxsize=None)
+def _crs_from_epsg(epsg: int) -> CRS:
+    """
+    Get a (cached) rasterio CRS for an EPSG code.
+
+    Passing "EPSG:n" strings makes every warp call parse the definition
+    through PROJ again; a CRS object is resolved once and reused.
+
+    Args:
+        epsg: EPSG code
+
+    Returns:
+        rasterio CRS
+    """
+    return CRS.from_epsg(epsg)
+
+
+def _tiled_gtiff_profile(meta: dict) -> dict:
+    """
+    Build a tiled, deflate-compressed GeoTIFF profile from raster metadata.
+
+    Args:
+        meta: Raster metadata (e.g. src.meta)
+
+    Returns:
+        Copy of meta with GeoTIFF creation options
+    """
+    profile = meta.copy()
+    # Floating-point predictor for float rasters, horizontal differencing otherwise
+    predictor = 3 if np.dtype(profile['dtype']).kind == 'f' else 2
+    profile.update({
+        'driver': 'GTiff',
+        'tiled': True,
+        'blockxsize': GTIFF_BLOCK_SIZE,
+        'blockysize': GTIFF_BLOCK_SIZE,
+        'compress': 'deflate',
+        'predictor': predictor
+    })
+    return profile
+
 
 class DEMProcessor:
     """Process DEM rasters for viewshed analysis."""
@@ -34,11 +94,12 @@ class DEMProcessor:
         self.dem_path = dem_path
         self.vegetation_path = vegetation_path
         self.processed_dem_path: Optional[str] = None
-        self.cell_index: Dict[int, Tuple[float, float]] = {}
         self.transform = None
         self.width = None
         self.height = None
         self.epsg = None
+        # Cell IDs with valid (non-nodata) elevation, ascending
+        self.valid_cell_ids: Optional[np.ndarray] = None
 
     def process(
         self,
@@ -78,14 +139,14 @@ class DEMProcessor:
             # If DEM is in a different CRS than our polygon, transform polygon to DEM CRS for clipping
             if dem_crs.to_epsg() != target_epsg:
                 logger.info(f"Transforming polygon from EPSG:{target_epsg} to {dem_crs} for clipping")
+                # Transform the shapely geometry directly through the cached
+                # transformer; no GeoJSON round trip
                 from app.core.crs_manager import CRSManager
-                buffered_geom_dict = mapping(buffered_geom)
-                transformed_geom_dict = CRSManager.transform_geometry(
-                    buffered_geom_dict,
+                buffered_geom = CRSManager.transform_geom(
+                    buffered_geom,
                     from_epsg=target_epsg,
                     to_epsg=dem_crs.to_epsg()
                 )
-                buffered_geom = shape(transformed_geom_dict)
 
         # Step 1: Clip DEM to buffered area (now in DEM's CRS)
         clipped_dem_path = self._clip_dem(buffered_geom, output_dir)
@@ -95,15 +156,13 @@ class DEMProcessor:
 
         # Step 3: Add vegetation if available
         if self.vegetation_path and os.path.exists(self.vegetation_path):
-            final_dem_path = self._add_vegetation(
-                reprojected_dem_path,
-                buffered_geom,
-                target_epsg,
-                output_dir
-            )
+            final_dem_path = self._add_vegetation(reprojected_dem_path, output_dir)
         else:
             final_dem_path = reprojected_dem_path
 
+        # Overviews only on the final DEM; intermediate files are read once
+        self._build_overviews(final_dem_path)
+
         # Step 4: Build cell index
         self._build_cell_index(final_dem_path)
 
@@ -135,8 +194,9 @@ class DEMProcessor:
             logger.info(f"Polygon bounds: {geom_shape.bounds}")
 
             try:
-                # Clip the raster
-                out_image, out_transform = mask(src, [geom], crop=True)
+                # Clip the raster: read only the window covering the geometry
+                # and mask that small array, instead of rasterio.mask.mask
+                out_image, out_transform = self._read_masked_window(src, geom_shape)
 
                 # Check if we got any data
                 if out_image.size == 0:
@@ -158,7 +218,7 @@ class DEMProcessor:
 
                 # Save clipped DEM
                 output_path = os.path.join(output_dir, "dem_clipped.tif")
-                with rasterio.open(output_path, "w", **out_meta) as dest:
+                with rasterio.open(output_path, "w", **_tiled_gtiff_profile(out_meta)) as dest:
                     dest.write(out_image)
 
                 logger.info(f"Clipped DEM saved: {out_image.shape}")
@@ -176,10 +236,68 @@ class DEMProcessor:
 
         return output_path
 
+    @staticmethod
+    def _read_masked_window(src, geom) -> Tuple[np.ndarray, Affine]:
+        """
+        Read the window covering a geometry and mask pixels outside it.
+
+        Equivalent to rasterio.mask.mask(src, [geom], crop=True), but only the
+        window's pixels are read and the mask is rasterized for that window.
+
+        Args:
+            src: Open rasterio dataset
+            geom: Shapely geometry in the dataset's CRS
+
+        Returns:
+            Tuple of (masked array (bands, rows, cols), window transform)
+
+        Raises:
+            ValueError: If the geometry does not overlap the raster
+        """
+        # Fail before any window math or read if the geometry misses the
+        # raster footprint (this also catches geometries whose bounding box
+        # overlaps the raster while the geometry itself does not)
+        if not geom.intersects(box(*src.bounds)):
+            raise ValueError("Input shapes do not overlap raster.")
+
+        # Pixel window of the geometry bounds, rounded outward to whole pixels
+        win = from_bounds(*geom.bounds, transform=src.transform)
+        row_start = int(np.floor(win.row_off))
+        col_start = int(np.floor(win.col_off))
+        row_stop = int(np.ceil(win.row_off + win.height))
+        col_stop = int(np.ceil(win.col_off + win.width))
+
+        try:
+            win = Window(
+                col_start, row_start, col_stop - col_start, row_stop - row_start
+            ).intersection(Window(0, 0, src.width, src.height))
+        except WindowError:
+            raise ValueError("Input shapes do not overlap raster.")
+
+        out_image = src.read(window=win)
+        out_transform = src.window_transform(win)
+
+        # Every pixel centre lies inside the geometry when it covers the whole
+        # window footprint, so there is nothing to rasterize
+        if geom.contains(box(*window_bounds(win, src.transform))):
+            return out_image, out_transform
+
+        # True for pixels outside the geometry
+        outside = geometry_mask(
+            [geom],
+            out_shape=out_image.shape[1:],
+            transform=out_transform
+        )
+        out_image[:, outside] = src.nodata if src.nodata is not None else 0
+
+        return out_image, out_transform
+
     def _reproject_dem(self, dem_path: str, target_epsg: int, output_dir: str) -> str:
         """Reproject DEM to target CRS."""
         logger.info(f"Reprojecting DEM to EPSG:{target_epsg}...")
 
+        dst_crs = _crs_from_epsg(target_epsg)
+
         with rasterio.open(dem_path) as src:
             src_crs = src.crs
 
@@ -191,7 +309,7 @@ class DEMProcessor:
             # Calculate transform
             transform, width, height = calculate_default_transform(
                 src_crs,
-                f"EPSG:{target_epsg}",
+                dst_crs,
                 src.width,
                 src.height,
                 *src.bounds
@@ -200,15 +318,17 @@ class DEMProcessor:
             # Update metadata
             kwargs = src.meta.copy()
             kwargs.update({
-                'crs': f"EPSG:{target_epsg}",
+                'crs': dst_crs,
                 'transform': transform,
                 'width': width,
                 'height': height
             })
 
-            # Perform reprojection
+            # Perform reprojection, letting GDAL's warper resample chunks on
+            # all cores
             output_path = os.path.join(output_dir, "dem_reprojected.tif")
-            with rasterio.open(output_path, 'w', **kwargs) as dst:
+            with rasterio.Env(**WARP_GDAL_ENV), \
+                    rasterio.open(output_path, 'w', **_tiled_gtiff_profile(kwargs)) as dst:
                 for i in range(1, src.count + 1):
                     reproject(
                         source=rasterio.band(src, i),
@@ -216,64 +336,70 @@ class DEMProcessor:
                         src_transform=src.transform,
                         src_crs=src.crs,
                         dst_transform=transform,
-                        dst_crs=f"EPSG:{target_epsg}",
-                        resampling=Resampling.bilinear
+                        dst_crs=dst_crs,
+                        resampling=Resampling.bilinear,
+                        num_threads=WARP_NUM_THREADS,
+                        warp_mem_limit=WARP_MEM_LIMIT_MB
                     )
 
         return output_path
 
-    def _add_vegetation(
-        self,
-        dem_path: str,
-        geom,
-        target_epsg: int,
-        output_dir: str
-    ) -> str:
+    def _add_vegetation(self, dem_path: str, output_dir: str) -> str:
         """Add vegetation height to DEM."""
         logger.info("Adding vegetation height to DEM...")
 
-        # Process vegetation raster similar to DEM
-        with rasterio.open(self.vegetation_path) as veg_src:
-            # Clip
-            veg_image, veg_transform = mask(veg_src, [geom], crop=True)
-
-            # Reproject if needed
-            if veg_src.crs.to_epsg() != target_epsg:
-                # Similar reprojection logic
-                pass
-
-        # Combine DEM + vegetation
-        with rasterio.open(dem_path) as dem_src:
+        with rasterio.open(dem_path) as dem_src, rasterio.open(self.vegetation_path) as veg_src:
             dem_data = dem_src.read(1)
 
-            # Resample vegetation to match DEM if needed
-            # For simplicity, assuming they match
-            veg_data = veg_image[0]
-
-            # Ensure same shape
-            if dem_data.shape != veg_data.shape:
-                # Resize vegetation data to match DEM
-                from scipy.ndimage import zoom
-                zoom_factors = (
-                    dem_data.shape[0] / veg_data.shape[0],
-                    dem_data.shape[1] / veg_data.shape[1]
-                )
-                veg_data = zoom(veg_data, zoom_factors, order=1)
+            # Resample vegetation straight onto the DEM grid. GDAL handles any
+            # CRS, resolution or extent difference and only reads the source
+            # windows it needs. Pixels without vegetation data come out as NaN
+            veg_data = np.full(dem_data.shape, np.nan, dtype=np.float32)
+            reproject(
+                source=rasterio.band(veg_src, 1),
+                destination=veg_data,
+                src_transform=veg_src.transform,
+                src_crs=veg_src.crs,
+                src_nodata=veg_src.nodata,
+                dst_transform=dem_src.transform,
+                dst_crs=dem_src.crs,
+                dst_nodata=np.nan,
+                resampling=Resampling.bilinear
+            )
 
-            # Combine: effective_surface = DEM + vegetation_height
-            combined = dem_data + veg_data
+            # Combine in place in a single pass: effective_surface = DEM + vegetation_height.
+            # Vegetation nodata pixels add nothing instead of poisoning the DEM
+            valid = ~np.isnan(veg_data)
+            np.add(dem_data, veg_data, out=dem_data, where=valid, casting='unsafe')
 
             # Save combined DEM
             output_path = os.path.join(output_dir, "dem_with_vegetation.tif")
             meta = dem_src.meta.copy()
 
-            with rasterio.open(output_path, 'w', **meta) as dst:
-                dst.write(combined, 1)
+            with rasterio.open(output_path, 'w', **_tiled_gtiff_profile(meta)) as dst:
+                dst.write(dem_data, 1)
 
         return output_path
 
+    def _build_overviews(self, dem_path: str):
+        """Build averaged overviews in place for the processed DEM."""
+        with rasterio.open(dem_path, 'r+') as dst:
+            factors = [f for f in OVERVIEW_FACTORS if min(dst.width, dst.height) // f > 0]
+            if not factors:
+                return
+
+            dst.build_overviews(factors, Resampling.average)
+            dst.update_tags(ns='rio_overview', resampling='average')
+
     def _build_cell_index(self, dem_path: str):
-        """Build index of cell ID to centroid coordinates."""
+        """
+        Record the grid geometry that cell IDs are decoded against.
+
+        Cell IDs are row-major (row * width + col), so a cell's centroid is
+        computed from the affine transform on demand rather than stored. Only
+        the IDs of cells with valid elevation are kept, which skips the nodata
+        margin left around the polygon by clipping.
+        """
         logger.info("Building cell index...")
 
         with rasterio.open(dem_path) as src:
@@ -281,16 +407,67 @@ class DEMProcessor:
             self.width = src.width
             self.height = src.height
             self.epsg = src.crs.to_epsg()
+            valid_mask = src.read_masks(1)
+
+        self.valid_cell_ids = np.flatnonzero(valid_mask)
+
+        logger.info(
+            f"Built index for {len(self.valid_cell_ids)} valid cells "
+            f"of {self.num_cells}"
+        )
+
+    @property
+    def num_cells(self) -> int:
+        """Number of cells in the DEM grid, including nodata cells."""
+        if self.width is None or self.height is None:
+            return 0
+        return self.width * self.height
 
-            cell_id = 0
-            for row in range(self.height):
-                for col in range(self.width):
-                    # Get cell centroid
-                    x, y = rasterio.transform.xy(self.transform, row, col, offset='center')
-                    self.cell_index[cell_id] = (x, y)
-                    cell_id += 1
+    def get_cell_row_col_arrays(self, cell_ids) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get raster (row, col) positions for many cell IDs as arrays.
+
+        Unknown cell IDs are dropped.
+
+        Args:
+            cell_ids: Iterable or array of cell IDs
+
+        Returns:
+            Tuple of (valid_cell_ids, rows, cols) arrays
+        """
+        if isinstance(cell_ids, np.ndarray):
+            ids = cell_ids.astype(np.int64, copy=False)
+        else:
+            # Size the array up front when the count is known (sets, lists), so
+            # fromiter fills it in one pass without regrowing
+            count = len(cell_ids) if hasattr(cell_ids, '__len__') else -1
+            ids = np.fromiter(cell_ids, dtype=np.int64, count=count)
+
+        ids = ids[(ids >= 0) & (ids < self.num_cells)]
+        rows, cols = np.divmod(ids, self.width) if len(ids) else (ids, ids)
+        return ids, rows, cols
+
+    def get_cell_coordinate_arrays(self, cell_ids) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get coordinates for many cell IDs as arrays.
+
+        Unknown cell IDs are dropped.
+
+        Args:
+            cell_ids: Iterable or array of cell IDs
+
+        Returns:
+            Tuple of (valid_cell_ids, xs, ys) arrays
+        """
+        ids, rows, cols = self.get_cell_row_col_arrays(cell_ids)
+        if len(ids) == 0:
+            empty = np.zeros(0, dtype=np.float64)
+            return ids, empty, empty
 
-        logger.info(f"Built index for {len(self.cell_index)} cells")
+        cols = cols + 0.5
+        rows = rows + 0.5
+        t = self.transform
+        return ids, t.a * cols + t.b * rows + t.c, t.d * cols + t.e * rows + t.f
 
     def get_cell_coordinates(self, cell_ids: list) -> list:
         """
@@ -302,7 +479,8 @@ class DEMProcessor:
         Returns:
             List of (x, y) tuples
         """
-        return [self.cell_index.get(cid) for cid in cell_ids if cid in self.cell_index]
+        _, xs, ys = self.get_cell_coordinate_arrays(cell_ids)
+        return list(zip(xs.tolist(), ys.tolist()))
 
     def get_cell_area(self) -> float:
         """
@@ -5,7 +5,9 @@ Creates an even distribution of points within the search polygon
 that serve as potential drone launch locations.
 """
 import numpy as np
-from shapely.geometry import shape, Point
+import shapely
+from scipy.spatial import cKDTree
+from shapely.geometry import shape
 from typing import List, Tuple
 import logging
 
@@ -68,15 +70,15 @@ class GridGenerator:
         # Create meshgrid
         xx, yy = np.meshgrid(x_coords, y_coords)
 
-        # Flatten and combine
-        points = list(zip(xx.flatten(), yy.flatten()))
+        # Flatten and filter to points inside polygon in one vectorized call.
+        # Preparing builds GEOS's indexed point locator once, so each test no
+        # longer walks every polygon vertex
+        xs = xx.ravel()
+        ys = yy.ravel()
+        shapely.prepare(geom)
+        inside = shapely.contains_xy(geom, xs, ys)
 
-        # Filter to points inside polygon
-        points_inside = []
-        for x, y in points:
-            point = Point(x, y)
-            if geom.contains(point):
-                points_inside.append((x, y))
+        points_inside = list(zip(xs[inside].tolist(), ys[inside].tolist()))
 
         logger.info(f"Generated {len(points_inside)} grid points inside polygon")
 
@@ -142,33 +144,32 @@ class GridGenerator:
         # Generate points along boundary
         num_boundary_points = int(boundary.length / boundary_spacing_m)
 
-        boundary_points = []
-        for i in range(num_boundary_points):
-            distance = (i / num_boundary_points) * boundary.length
-            point = boundary.interpolate(distance)
-            boundary_points.append((point.x, point.y))
+        # Interpolate all boundary points in one vectorized call
+        distances = np.arange(num_boundary_points) / max(num_boundary_points, 1) * boundary.length
+        coords = shapely.get_coordinates(shapely.line_interpolate_point(boundary, distances))
+        boundary_points = list(map(tuple, coords.tolist()))
 
         logger.info(f"Added {len(boundary_points)} boundary points")
 
         # Combine and remove duplicates
         all_points = grid_points + boundary_points
 
-        # Remove points that are too close together
-        unique_points = []
+        # Remove points that are too close together. Points are kept greedily in
+        # order, so a point is dropped only if an earlier *kept* point lies
+        # closer than min_dist. A KD-tree finds each point's neighbors up front
+        # instead of comparing against every kept point
         min_dist = boundary_spacing_m / 2
+        if not all_points:
+            return []
 
-        for pt in all_points:
-            is_unique = True
-            for existing_pt in unique_points:
-                dist = np.sqrt(
-                    (pt[0] - existing_pt[0])**2 +
-                    (pt[1] - existing_pt[1])**2
-                )
-                if dist < min_dist:
-                    is_unique = False
-                    break
-
-            if is_unique:
-                unique_points.append(pt)
-
-        return unique_points
+        coords = np.asarray(all_points, dtype=np.float64)
+        tree = cKDTree(coords)
+
+        # query_ball_point includes points at exactly r; the original test is strict
+        neighbors = tree.query_ball_point(coords, r=np.nextafter(min_dist, 0))
+
+        kept = np.zeros(len(all_points), dtype=bool)
+        for idx, nbrs in enumerate(neighbors):
+            kept[idx] = not any(kept[j] for j in nbrs if j < idx)
+
+        return [pt for pt, keep in zip(all_points, kept) if keep]
@@ -4,25 +4,43 @@ KML/KMZ Export functionality.
 Exports segments, launch points, and search boundaries to KML format
 for use in field operations.
 """
-import simplekml
-from typing import List, Dict
+from typing import Iterator, Dict, List
+from xml.sax.saxutils import escape
 import logging
+import numpy as np
+
+from app.models.segment_table import SegmentTable
 
 logger = logging.getLogger(__name__)
 
+# KML colors are aabbggrr hex strings
+KML_RED = 'ff0000ff'
+KML_BLACK = 'ff000000'
+
+# Color palette for segments, cycled by sequence number
+# (blue, green, yellow, orange, purple, cyan, pink)
+SEGMENT_COLORS = [
+    'ffff0000',
+    'ff008000',
+    'ff00ffff',
+    'ff00a5ff',
+    'ff800080',
+    'ffffff00',
+    'ffcbc0ff',
+]
+
+LAUNCH_ICON_HREF = 'http://maps.google.com/mapfiles/kml/shapes/heliport.png'
+STATS_ICON_HREF = 'http://maps.google.com/mapfiles/kml/shapes/info.png'
+
 
 class KMLExporter:
     """Export segments to KML/KMZ format."""
 
-    def __init__(self):
-        """Initialize KML exporter."""
-        self.kml = None
-
     def export_project(
         self,
         project_name: str,
         search_polygon: dict,
-        segments: List[Dict],
+        segments: SegmentTable,
         output_path: str,
         include_stats: bool = True
     ) -> str:
@@ -32,7 +50,7 @@ class KMLExporter:
         Args:
             project_name: Name of the project
             search_polygon: Search boundary polygon (GeoJSON in WGS84)
-            segments: List of segment dictionaries (in WGS84)
+            segments: Segment table (in WGS84)
             output_path: Path to save KML file
             include_stats: Include statistics folder
 
@@ -41,159 +59,193 @@ class KMLExporter:
         """
         logger.info(f"Exporting project '{project_name}' to KML...")
 
-        self.kml = simplekml.Kml()
-        self.kml.document.name = project_name
-
-        # Add search boundary
-        self._add_search_boundary(search_polygon)
-
-        # Add segments
-        self._add_segments(segments)
-
-        # Add launch points
-        self._add_launch_points(segments)
-
-        # Add statistics
-        if include_stats:
-            self._add_statistics(segments, project_name)
-
-        # Save KML
-        self.kml.save(output_path)
+        # Write the streamed chunks straight to disk; the document is never
+        # held in memory as a whole
+        with open(output_path, 'wb') as f:
+            for chunk in self.iter_export(project_name, search_polygon, segments, include_stats):
+                f.write(chunk)
 
         logger.info(f"KML saved to {output_path}")
 
         return output_path
 
-    def _add_search_boundary(self, polygon_geojson: dict):
-        """Add search boundary to KML."""
-        folder = self.kml.newfolder(name="Search Boundary")
-
-        # Extract coordinates from GeoJSON
-        coords = self._extract_coordinates(polygon_geojson)
-
-        if coords:
-            poly = folder.newpolygon(name="Search Area")
-            poly.outerboundaryis = coords
-
-            # Style
-            poly.style.linestyle.color = simplekml.Color.red
-            poly.style.linestyle.width = 3
-            poly.style.polystyle.color = simplekml.Color.changealphaint(50, simplekml.Color.red)
-
-    def _add_segments(self, segments: List[Dict]):
-        """Add segment polygons to KML."""
-        folder = self.kml.newfolder(name="Search Segments")
-
-        # Color palette for segments
-        colors = [
-            simplekml.Color.blue,
-            simplekml.Color.green,
-            simplekml.Color.yellow,
-            simplekml.Color.orange,
-            simplekml.Color.purple,
-            simplekml.Color.cyan,
-            simplekml.Color.pink,
-        ]
-
-        for segment in segments:
-            seq = segment['sequence']
-            polygon_geom = segment['polygon']
-
-            # Description
-            desc = self._build_segment_description(segment)
-
-            # Style - cycle through colors
-            color = colors[(seq - 1) % len(colors)]
-
-            # Extract all polygon coordinates (handles both Polygon and MultiPolygon)
-            all_coords = self._extract_all_coordinates(polygon_geom)
-
-            if len(all_coords) == 1:
-                # Single polygon - create simple polygon
-                poly = folder.newpolygon(name=f"Segment {seq}")
-                poly.outerboundaryis = all_coords[0]
-                poly.description = desc
-                poly.style.linestyle.color = simplekml.Color.black
-                poly.style.linestyle.width = 2
-                poly.style.polystyle.color = simplekml.Color.changealphaint(100, color)
-            else:
-                # MultiPolygon - create a single placemark with MultiGeometry
-                multi = folder.newmultigeometry(name=f"Segment {seq}")
-                multi.description = desc
-
-                for coords in all_coords:
-                    if coords:
-                        poly = multi.newpolygon()
-                        poly.outerboundaryis = coords
-                        poly.style.linestyle.color = simplekml.Color.black
-                        poly.style.linestyle.width = 2
-                        poly.style.polystyle.color = simplekml.Color.changealphaint(100, color)
-
-    def _add_launch_points(self, segments: List[Dict]):
-        """Add launch points to KML."""
-        folder = self.kml.newfolder(name="Launch Points")
-
-        for segment in segments:
-            seq = segment['sequence']
-            launch_point = segment['launch_point']
-
-            # Extract coordinates
-            if 'coordinates' in launch_point:
-                lon, lat = launch_point['coordinates']
-            else:
-                continue
-
-            # Create placemark
-            pnt = folder.newpoint(name=f"Launch Point {seq}")
-            pnt.coords = [(lon, lat)]
-
-            # Description
-            desc = f"""
-            <b>Segment {seq} Launch Point</b><br/>
-            Coordinates: {lat:.6f}, {lon:.6f}<br/>
-            Area: {segment.get('area_acres', 0):.2f} acres<br/>
-            Access: {segment.get('access_type', 'unknown')}
-            """
-            pnt.description = desc
+    def iter_export(
+        self,
+        project_name: str,
+        search_polygon: dict,
+        segments: SegmentTable,
+        include_stats: bool = True
+    ) -> Iterator[bytes]:
+        """
+        Generate the project KML incrementally.
 
-            # Style
-            pnt.style.iconstyle.icon.href = 'http://maps.google.com/mapfiles/kml/shapes/heliport.png'
-            pnt.style.iconstyle.scale = 1.2
+        Yields the document header, one chunk per placemark, and the footer,
+        so the KML can be streamed to a client without building an object tree
+        or writing a file first. Styles are declared once in the document and
+        referenced by every placemark.
 
-    def _add_statistics(self, segments: List[Dict], project_name: str):
-        """Add statistics folder to KML."""
-        folder = self.kml.newfolder(name="Statistics")
+        Records and coordinates are extracted before the iterator is returned,
+        so malformed input raises here and not after a response has started.
 
-        # Calculate statistics
-        total_segments = len(segments)
-        total_area_acres = sum(seg.get('area_acres', 0) for seg in segments)
+        Args:
+            project_name: Name of the project
+            search_polygon: Search boundary polygon (GeoJSON in WGS84)
+            segments: Segment table (in WGS84)
+            include_stats: Include statistics folder
 
-        areas = [seg.get('area_acres', 0) for seg in segments]
-        min_area = min(areas) if areas else 0
-        max_area = max(areas) if areas else 0
-        avg_area = total_area_acres / total_segments if total_segments > 0 else 0
+        Returns:
+            Iterator of UTF-8 encoded KML chunks
+        """
+        logger.info(f"Streaming project '{project_name}' as KML...")
 
-        # Create a point for statistics (at first launch point)
-        if segments and segments[0]['launch_point'].get('coordinates'):
-            lon, lat = segments[0]['launch_point']['coordinates']
+        boundary_coords = self._extract_coordinates(search_polygon)
+        records = segments.to_records()
+        segment_coords = [
+            [c for c in self._extract_all_coordinates(segment['polygon']) if c]
+            for segment in records
+        ]
 
-            stats_point = folder.newpoint(name="Project Statistics")
-            stats_point.coords = [(lon, lat)]
+        return self._generate_kml(
+            project_name,
+            boundary_coords,
+            records,
+            segment_coords,
+            segments,
+            include_stats
+        )
 
-            desc = f"""
-            <h2>{project_name} - Statistics</h2>
-            <table border="1">
-                <tr><td><b>Total Segments</b></td><td>{total_segments}</td></tr>
-                <tr><td><b>Total Area</b></td><td>{total_area_acres:.2f} acres</td></tr>
-                <tr><td><b>Average Segment Size</b></td><td>{avg_area:.2f} acres</td></tr>
-                <tr><td><b>Min Segment Size</b></td><td>{min_area:.2f} acres</td></tr>
-                <tr><td><b>Max Segment Size</b></td><td>{max_area:.2f} acres</td></tr>
-            </table>
-            """
-            stats_point.description = desc
+    def _generate_kml(
+        self,
+        project_name: str,
+        boundary_coords: list,
+        records: List[Dict],
+        segment_coords: List[list],
+        segments: SegmentTable,
+        include_stats: bool
+    ) -> Iterator[bytes]:
+        """Yield the KML chunks from already extracted records and coordinates."""
+        yield self._kml_header(project_name).encode('utf-8')
+
+        # Search boundary
+        yield b'<Folder><name>Search Boundary</name>\n'
+        if boundary_coords:
+            yield self._kml_placemark(
+                'Search Area',
+                None,
+                'boundary',
+                self._kml_polygon(boundary_coords)
+            ).encode('utf-8')
+        yield b'</Folder>\n'
+
+        # Segments
+        yield b'<Folder><name>Search Segments</name>\n'
+        for segment, coords in zip(records, segment_coords):
+            seq = segment['sequence']
+            polygons = [self._kml_polygon(c) for c in coords]
+            if not polygons:
+                continue
 
-            # Style
-            stats_point.style.iconstyle.icon.href = 'http://maps.google.com/mapfiles/kml/shapes/info.png'
+            geometry = polygons[0] if len(polygons) == 1 else (
+                '<MultiGeometry>' + ''.join(polygons) + '</MultiGeometry>'
+            )
+            yield self._kml_placemark(
+                f"Segment {seq}",
+                self._build_segment_description(segment),
+                f"segment{(seq - 1) % len(SEGMENT_COLORS)}",
+                geometry
+            ).encode('utf-8')
+        yield b'</Folder>\n'
+
+        # Launch points
+        yield b'<Folder><name>Launch Points</name>\n'
+        for segment in records:
+            if segment['launch_point'] is None:
+                continue
+            lon, lat = segment['launch_point']['coordinates']
+            yield self._kml_placemark(
+                f"Launch Point {segment['sequence']}",
+                self._build_launch_point_description(segment),
+                'launch',
+                f"<Point><coordinates>{lon},{lat},0</coordinates></Point>"
+            ).encode('utf-8')
+        yield b'</Folder>\n'
+
+        # Statistics
+        if include_stats:
+            yield b'<Folder><name>Statistics</name>\n'
+            if len(segments) and segments.has_launch_point[0]:
+                lon, lat = segments.launch_point[0].tolist()
+                yield self._kml_placemark(
+                    'Project Statistics',
+                    self._build_statistics_description(segments, project_name),
+                    'stats',
+                    f"<Point><coordinates>{lon},{lat},0</coordinates></Point>"
+                ).encode('utf-8')
+            yield b'</Folder>\n'
+
+        yield b'</Document>\n</kml>\n'
+
+    def _kml_header(self, project_name: str) -> str:
+        """Build the KML document header with the shared style definitions."""
+        styles = [
+            self._kml_poly_style('boundary', KML_RED, 3, self._with_alpha(50, KML_RED))
+        ]
+        for idx, color in enumerate(SEGMENT_COLORS):
+            styles.append(self._kml_poly_style(
+                f"segment{idx}",
+                KML_BLACK,
+                2,
+                self._with_alpha(100, color)
+            ))
+        styles.append(
+            '<Style id="launch"><IconStyle><scale>1.2</scale>'
+            f'<Icon><href>{LAUNCH_ICON_HREF}</href></Icon></IconStyle></Style>\n'
+        )
+        styles.append(
+            '<Style id="stats"><IconStyle>'
+            f'<Icon><href>{STATS_ICON_HREF}</href></Icon></IconStyle></Style>\n'
+        )
+
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<kml xmlns="http://www.opengis.net/kml/2.2">\n'
+            f'<Document><name>{escape(project_name)}</name>\n'
+            + ''.join(styles)
+        )
+
+    @staticmethod
+    def _kml_poly_style(style_id: str, line_color: str, line_width: int, fill_color: str) -> str:
+        """Build a shared polygon <Style> element."""
+        return (
+            f'<Style id="{style_id}">'
+            f'<LineStyle><color>{line_color}</color><width>{line_width}</width></LineStyle>'
+            f'<PolyStyle><color>{fill_color}</color></PolyStyle>'
+            '</Style>\n'
+        )
+
+    @staticmethod
+    def _with_alpha(alpha: int, color: str) -> str:
+        """Replace the alpha channel (0-255) of an aabbggrr color."""
+        return f"{alpha:02x}{color[2:]}"
+
+    @staticmethod
+    def _kml_polygon(coords: list) -> str:
+        """Build a <Polygon> element from an outer ring of (lon, lat) pairs."""
+        ring = ' '.join(f"{lon},{lat},0" for lon, lat in coords)
+        return (
+            '<Polygon><outerBoundaryIs><LinearRing>'
+            f'<coordinates>{ring}</coordinates>'
+            '</LinearRing></outerBoundaryIs></Polygon>'
+        )
+
+    @staticmethod
+    def _kml_placemark(name: str, description: str, style_id: str, geometry: str) -> str:
+        """Build a <Placemark> element referencing a shared style."""
+        desc = f'<description>{escape(description)}</description>' if description else ''
+        return (
+            f'<Placemark><name>{escape(name)}</name>{desc}'
+            f'<styleUrl>#{style_id}</styleUrl>{geometry}</Placemark>\n'
+        )
 
     def _extract_all_coordinates(self, geojson_geom: dict) -> list:
         """
@@ -211,16 +263,11 @@ class KMLExporter:
 
         if geom_type == 'Polygon':
             coords = geojson_geom['coordinates'][0]  # Outer ring
-            return [[(lon, lat) for lon, lat in coords]]
+            return [self._ring_coordinates(coords)]
 
         elif geom_type == 'MultiPolygon':
-            # Extract all polygons
-            all_polys = geojson_geom['coordinates']
-            result = []
-            for poly in all_polys:
-                coords = poly[0]  # Outer ring of this polygon
-                result.append([(lon, lat) for lon, lat in coords])
-            return result
+            # Outer ring of each polygon
+            return [self._ring_coordinates(poly[0]) for poly in geojson_geom['coordinates']]
 
         return []
 
@@ -238,7 +285,7 @@ class KMLExporter:
 
         if geom_type == 'Polygon':
             coords = geojson_geom['coordinates'][0]  # Outer ring
-            return [(lon, lat) for lon, lat in coords]
+            return self._ring_coordinates(coords)
 
         elif geom_type == 'MultiPolygon':
             # Use the largest polygon from MultiPolygon
@@ -255,17 +302,72 @@ class KMLExporter:
                 f"Using largest polygon only."
             )
 
-            return [(lon, lat) for lon, lat in coords]
+            return self._ring_coordinates(coords)
 
         return []
 
+    @staticmethod
+    def _ring_coordinates(ring: list) -> list:
+        """
+        Convert a GeoJSON ring to a list of [lon, lat] pairs.
+
+        Goes through one numpy array and tolist(), which runs in C, instead of
+        unpacking every vertex in Python. Any Z values are dropped.
+
+        Args:
+            ring: GeoJSON linear ring coordinates
+
+        Returns:
+            List of [lon, lat] pairs
+        """
+        if len(ring) == 0:
+            return []
+        return np.asarray(ring, dtype=np.float64)[:, :2].tolist()
+
     def _build_segment_description(self, segment: Dict) -> str:
         """Build HTML description for segment."""
+        if segment['launch_point'] is not None:
+            lon, lat = segment['launch_point']['coordinates']
+            launch = f"{lat:.6f}, {lon:.6f}"
+        else:
+            launch = 'unknown'
         desc = f"""
         <b>Segment {segment['sequence']}</b><br/>
         Area: {segment.get('area_acres', 0):.2f} acres ({segment.get('area_m2', 0):.0f} m²)<br/>
         Access Type: {segment.get('access_type', 'unknown')}<br/>
-        Launch Point: {segment['launch_point'].get('coordinates', ['?', '?'])[1]:.6f},
-                      {segment['launch_point'].get('coordinates', ['?', '?'])[0]:.6f}
+        Launch Point: {launch}
         """
         return desc
+
+    def _build_launch_point_description(self, segment: Dict) -> str:
+        """Build HTML description for a launch point."""
+        lon, lat = segment['launch_point']['coordinates']
+        desc = f"""
+            <b>Segment {segment['sequence']} Launch Point</b><br/>
+            Coordinates: {lat:.6f}, {lon:.6f}<br/>
+            Area: {segment.get('area_acres', 0):.2f} acres<br/>
+            Access: {segment.get('access_type', 'unknown')}
+            """
+        return desc
+
+    def _build_statistics_description(self, segments: SegmentTable, project_name: str) -> str:
+        """Build HTML statistics table, computed directly on the area column."""
+        total_segments = len(segments)
+        areas = segments.area_acres
+        total_area_acres = float(areas.sum())
+
+        min_area = float(areas.min()) if total_segments else 0
+        max_area = float(areas.max()) if total_segments else 0
+        avg_area = total_area_acres / total_segments if total_segments > 0 else 0
+
+        desc = f"""
+            <h2>{project_name} - Statistics</h2>
+            <table border="1">
+                <tr><td><b>Total Segments</b></td><td>{total_segments}</td></tr>
+                <tr><td><b>Total Area</b></td><td>{total_area_acres:.2f} acres</td></tr>
+                <tr><td><b>Average Segment Size</b></td><td>{avg_area:.2f} acres</td></tr>
+                <tr><td><b>Min Segment Size</b></td><td>{min_area:.2f} acres</td></tr>
+                <tr><td><b>Max Segment Size</b></td><td>{max_area:.2f} acres</td></tr>
+            </table>
+            """
+        return desc
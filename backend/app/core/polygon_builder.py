@@ -3,14 +3,50 @@ Segment Polygon Constructor.
 
 Converts visibility cell sets into actual polygon geometries.
 """
-from typing import Set, List, Tuple, Dict
-from shapely.geometry import box, Point, Polygon, MultiPolygon, mapping, shape
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import Iterable, List, Tuple, Dict, Optional
+import numpy as np
+import shapely
+from affine import Affine
+from rasterio.features import shapes
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from shapely.geometry import Point, Polygon, MultiPolygon, mapping, shape
 from shapely.geometry.base import BaseGeometry
+from shapely.strtree import STRtree
 from shapely.ops import unary_union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Threads used to build segment polygons in parallel
+SEGMENT_BUILD_WORKERS = os.cpu_count() or 1
+
+# Tolerance doublings tried when simplifying a polygon down to max_vertices
+MAX_SIMPLIFY_PASSES = 10
+
+# Largest simplification tolerance used to meet max_vertices, in cells. A
+# polygon that still has too many vertices at this tolerance is kept over
+# budget rather than simplified further, which could erase whole parts
+MAX_SIMPLIFY_TOLERANCE_CELLS = 2.0
+
+# Processed segments collected in _remove_overlaps before its STRtree is
+# rebuilt; newer segments are checked by their bounds until then
+OVERLAP_INDEX_REBUILD = 32
+
+# Half width, in cells, of the square joining two cells that touch only at a
+# corner. Two quarters of the square fall outside the segment's cells, so
+# each joint adds 2 * half_width² cell areas
+DIAGONAL_BRIDGE_HALF_WIDTH_CELLS = 0.1
+
+# Segments per quarter circle in the post-clip consolidation buffers. The
+# buffers only close sub-cell gaps, so coarse round joins merge the same parts
+# as shapely's default of 16 with a fraction of the vertices
+CONSOLIDATION_QUAD_SEGS = 2
+
 
 class PolygonBuilder:
     """Build segment polygons from visibility cells."""
@@ -26,6 +62,60 @@ class PolygonBuilder:
         self.dem_processor = dem_processor
         self.progress_callback = progress_callback
 
+    @staticmethod
+    def _segment_shape(segment: Dict) -> BaseGeometry:
+        """
+        Get a segment's polygon as a shapely geometry.
+
+        The parsed geometry is cached on the segment under '_shape' together
+        with the GeoJSON dict it came from, so it is only parsed again if
+        segment['polygon'] has been replaced since.
+
+        Args:
+            segment: Segment dictionary with a GeoJSON 'polygon'
+
+        Returns:
+            Shapely geometry of the segment polygon
+        """
+        polygon = segment['polygon']
+        cached = segment.get('_shape')
+        if cached is None or cached[0] is not polygon:
+            cached = (polygon, shape(polygon))
+            segment['_shape'] = cached
+        return cached[1]
+
+    @staticmethod
+    def _set_segment_polygon(segment: Dict, polygon: BaseGeometry):
+        """
+        Replace a segment's polygon, keeping its GeoJSON, cached shape and areas in sync.
+
+        Args:
+            segment: Segment dictionary to update
+            polygon: New shapely polygon (projected CRS)
+        """
+        segment['polygon'] = mapping(polygon)
+        segment['_shape'] = (segment['polygon'], polygon)
+        segment['area_m2'] = polygon.area
+        segment['area_acres'] = polygon.area / 4046.86
+
+    @staticmethod
+    def _parts_by_area(geom: MultiPolygon) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Split a MultiPolygon into its parts, largest first.
+
+        Args:
+            geom: Input MultiPolygon
+
+        Returns:
+            Tuple of (parts, areas) arrays sorted by descending area
+        """
+        parts = shapely.get_parts(geom)
+        areas = shapely.area(parts)
+
+        # Stable, so equal-area parts keep their original order
+        order = np.argsort(-areas, kind='stable')
+        return parts[order], areas[order]
+
     def _ensure_single_polygon(self, geom: BaseGeometry, segment_id: str = "") -> Polygon:
         """
         Ensure geometry is a single Polygon by selecting the largest part if MultiPolygon.
@@ -46,16 +136,15 @@ class PolygonBuilder:
             return geom
         elif isinstance(geom, ShapelyMultiPolygon):
             # Pick the largest part by area
-            parts_with_area = [(p, p.area) for p in geom.geoms]
-            parts_with_area.sort(key=lambda x: x[1], reverse=True)
+            parts, areas = self._parts_by_area(geom)
 
-            largest_part = parts_with_area[0][0]
-            largest_area = parts_with_area[0][1]
+            largest_part = parts[0]
+            largest_area = areas[0]
             total_area = geom.area
 
             # Log the conversion
-            num_parts = len(parts_with_area)
-            discarded_area = sum(area for _, area in parts_with_area[1:])
+            num_parts = len(parts)
+            discarded_area = areas[1:].sum()
             discarded_pct = (discarded_area / total_area * 100) if total_area > 0 else 0
 
             logger.info(
@@ -70,6 +159,33 @@ class PolygonBuilder:
             logger.warning(f"Segment {segment_id}: Unexpected geometry type {type(geom).__name__}, attempting conversion")
             return ShapelyPolygon(geom.exterior) if hasattr(geom, 'exterior') else geom
 
+    @staticmethod
+    def _make_valid_polygon(geom: BaseGeometry) -> BaseGeometry:
+        """
+        Repair an invalid polygonal geometry with GEOS MakeValid.
+
+        MakeValid keeps every part of the input, but may return a
+        GeometryCollection with collapsed lines or points next to the
+        polygons; only the polygonal parts are kept.
+
+        Args:
+            geom: Invalid Polygon or MultiPolygon
+
+        Returns:
+            Valid Polygon or MultiPolygon (empty Polygon if nothing is left)
+        """
+        fixed = shapely.make_valid(geom)
+        if isinstance(fixed, (Polygon, MultiPolygon)):
+            return fixed
+
+        parts = shapely.get_parts(shapely.get_parts(fixed))
+        polygons = parts[shapely.get_type_id(parts) == 3]
+        if len(polygons) == 0:
+            return Polygon()
+        if len(polygons) == 1:
+            return polygons[0]
+        return shapely.multipolygons(polygons)
+
     def remove_holes(self, polygon, min_hole_area=100):
         """
         Remove interior holes (rings) from a polygon to create solid segments.
@@ -84,28 +200,33 @@ class PolygonBuilder:
         Returns:
             Polygon or MultiPolygon without small holes
         """
-        from shapely.geometry import Polygon as ShapelyPolygon, MultiPolygon as ShapelyMultiPolygon
+        if not isinstance(polygon, (Polygon, MultiPolygon)):
+            return polygon
 
-        if isinstance(polygon, ShapelyPolygon):
-            if polygon.interiors:
-                # Keep only large holes (if any)
-                exteriors = [polygon.exterior]
-                large_holes = [interior for interior in polygon.interiors
-                              if ShapelyPolygon(interior).area >= min_hole_area]
-
-                if large_holes:
-                    return ShapelyPolygon(exteriors[0], holes=large_holes)
-                else:
-                    # No holes to keep - return solid polygon
-                    return ShapelyPolygon(exteriors[0])
+        # Work on all parts and rings at once; parts without holes pass through
+        parts = shapely.get_parts(polygon)
+        if not shapely.get_num_interior_rings(parts).any():
             return polygon
 
-        elif isinstance(polygon, ShapelyMultiPolygon):
-            # Remove holes from each polygon in the multipolygon
-            cleaned_polys = [self.remove_holes(p, min_hole_area) for p in polygon.geoms]
-            return ShapelyMultiPolygon(cleaned_polys)
+        rings, part_index = shapely.get_rings(parts, return_index=True)
 
-        return polygon
+        # The first ring of each part is its exterior, which is always kept
+        is_exterior = np.ones(len(rings), dtype=bool)
+        is_exterior[1:] = part_index[1:] != part_index[:-1]
+
+        keep = is_exterior.copy()
+        holes = ~is_exterior
+        keep[holes] = shapely.area(shapely.polygons(rings[holes])) >= min_hole_area
+
+        if keep.all():
+            # Every hole is kept - the polygon is unchanged
+            return polygon
+
+        cleaned_parts = shapely.polygons(rings[keep], indices=part_index[keep])
+
+        if isinstance(polygon, Polygon):
+            return cleaned_parts[0]
+        return shapely.multipolygons(cleaned_parts)
 
     def consolidate_multipolygon(self, polygon, min_part_area=1000, min_part_ratio=0.05):
         """
@@ -139,23 +260,14 @@ class PolygonBuilder:
             total_area = polygon.area
 
             # Sort parts by area (largest first)
-            parts_with_area = [(p, p.area) for p in polygon.geoms]
-            parts_with_area.sort(key=lambda x: x[1], reverse=True)
-
-            # Keep parts that meet minimum criteria
-            kept_parts = []
-            removed_count = 0
-            removed_area = 0
-
-            for part, area in parts_with_area:
-                area_ratio = area / total_area if total_area > 0 else 0
+            parts, areas = self._parts_by_area(polygon)
+            area_ratios = areas / total_area if total_area > 0 else np.zeros_like(areas)
 
-                # Keep if it meets either threshold
-                if area >= min_part_area or area_ratio >= min_part_ratio:
-                    kept_parts.append(part)
-                else:
-                    removed_count += 1
-                    removed_area += area
+            # Keep parts that meet either threshold
+            keep = (areas >= min_part_area) | (area_ratios >= min_part_ratio)
+            kept_parts = parts[keep]
+            removed_count = int(np.count_nonzero(~keep))
+            removed_area = areas[~keep].sum()
 
             if removed_count > 0:
                 logger.info(
@@ -166,7 +278,7 @@ class PolygonBuilder:
             # CHANGE: Always return a single Polygon (pick largest if multiple remain)
             if len(kept_parts) == 0:
                 logger.warning("All parts removed during consolidation, keeping largest original part")
-                return parts_with_area[0][0]  # Return largest original part
+                return parts[0]  # Return largest original part
             elif len(kept_parts) == 1:
                 return kept_parts[0]  # Single polygon
             else:
@@ -179,54 +291,234 @@ class PolygonBuilder:
 
         return polygon
 
+    @staticmethod
+    def _trace_cell_mask(cell_mask: np.ndarray, window_transform: Affine) -> BaseGeometry:
+        """
+        Trace the outline of a cell mask into polygon geometry.
+
+        Args:
+            cell_mask: uint8 mask, 1 for cells in the segment
+            window_transform: Affine transform of the mask window
+
+        Returns:
+            Polygon, or MultiPolygon if the cells form several 4-connected parts
+        """
+        footprint = [
+            shape(geom)
+            for geom, _ in shapes(
+                cell_mask,
+                mask=cell_mask.astype(bool),
+                transform=window_transform
+            )
+        ]
+
+        # Traced parts are disjoint 4-connected regions that touch at most at
+        # corners, so they already form a valid MultiPolygon and no GEOS
+        # union is needed; fall back to one if GDAL emitted anything invalid
+        if len(footprint) == 1:
+            return footprint[0]
+
+        traced = shapely.multipolygons(footprint)
+        if not traced.is_valid:
+            traced = shapely.union_all(footprint)
+        return traced
+
+    @staticmethod
+    def _bridge_diagonal_contacts(
+        footprint: BaseGeometry,
+        cell_mask: np.ndarray,
+        window_transform: Affine
+    ) -> BaseGeometry:
+        """
+        Connect cells that touch only at a corner.
+
+        Every 2x2 block of the mask holding exactly one diagonal pair of cells
+        gets a small square centred on the pair's shared corner, which is
+        unioned into the traced footprint. The square overlaps the two cells
+        and only adds a sliver of the two empty ones, so the segment gains
+        little area outside its cells. Parts separated by at least one empty
+        cell are left apart.
+
+        Args:
+            footprint: Traced outline of cell_mask (see _trace_cell_mask)
+            cell_mask: uint8 mask, 1 for cells in the segment
+            window_transform: Affine transform of the mask window
+
+        Returns:
+            Footprint with the corner contacts bridged
+        """
+        filled = cell_mask.astype(bool)
+        top_left = filled[:-1, :-1]
+        top_right = filled[:-1, 1:]
+        bottom_left = filled[1:, :-1]
+        bottom_right = filled[1:, 1:]
+
+        falling = top_left & bottom_right & ~top_right & ~bottom_left
+        rising = top_right & bottom_left & ~top_left & ~bottom_right
+
+        # The shared corner of block (row, col) is the grid vertex (row + 1, col + 1)
+        rows, cols = np.nonzero(falling | rising)
+        if len(rows) == 0:
+            return footprint
+
+        xs = window_transform.c + window_transform.a * (cols + 1) + window_transform.b * (rows + 1)
+        ys = window_transform.f + window_transform.d * (cols + 1) + window_transform.e * (rows + 1)
+        half_width = DIAGONAL_BRIDGE_HALF_WIDTH_CELLS * abs(window_transform.a)
+
+        bridges = shapely.box(xs - half_width, ys - half_width, xs + half_width, ys + half_width)
+        return shapely.union_all(np.append(bridges, footprint))
+
+    @staticmethod
+    def _simplify_to_vertex_budget(
+        polygon: BaseGeometry,
+        tolerance: float,
+        max_vertices: int,
+        max_tolerance: float
+    ) -> BaseGeometry:
+        """
+        Simplify a polygon until it has at most max_vertices coordinates.
+
+        The tolerance is doubled on each pass up to max_tolerance, and every
+        pass simplifies the input polygon, so errors do not accumulate.
+        Topology is preserved, so a polygon can stay above the budget if its
+        rings cannot shrink further within max_tolerance; the smallest result
+        is returned then.
+
+        Args:
+            polygon: Input polygon (unsimplified)
+            tolerance: Starting simplification tolerance (meters)
+            max_vertices: Maximum number of coordinates
+            max_tolerance: Largest tolerance tried (meters)
+
+        Returns:
+            Simplified polygon
+        """
+        num_coords = shapely.get_num_coordinates(polygon)
+        if num_coords <= max_vertices:
+            return polygon
+
+        simplified = polygon
+        tolerance = min(tolerance, max_tolerance)
+        for _ in range(MAX_SIMPLIFY_PASSES):
+            candidate = polygon.simplify(tolerance, preserve_topology=True)
+            candidate_coords = shapely.get_num_coordinates(candidate)
+            if candidate_coords < num_coords:
+                simplified, num_coords = candidate, candidate_coords
+            if num_coords <= max_vertices or tolerance >= max_tolerance:
+                break
+            tolerance = min(tolerance * 2, max_tolerance)
+
+        if num_coords > max_vertices:
+            logger.warning(
+                f"Segment polygon still has {num_coords} coordinates after simplification "
+                f"at {tolerance:.1f} m (budget {max_vertices})"
+            )
+
+        return simplified
+
+    @staticmethod
+    def _group_nearby_parts(parts: np.ndarray, distance: float) -> Tuple[int, np.ndarray]:
+        """
+        Group polygon parts that are chained together within a distance.
+
+        Two parts share a group when they are within distance of each other,
+        directly or through other parts of the group.
+
+        Args:
+            parts: Array of polygon parts
+            distance: Distance threshold (meters)
+
+        Returns:
+            Tuple of (number of groups, group label per part)
+        """
+        left, right = STRtree(parts).query(parts, predicate='dwithin', distance=distance)
+        adjacency = coo_matrix(
+            (np.ones(len(left), dtype=bool), (left, right)),
+            shape=(len(parts), len(parts))
+        )
+        return connected_components(adjacency, directed=False)
+
     def build_segment_polygon(
         self,
-        cell_ids: Set[int],
+        cell_ids: Iterable[int],
         search_polygon_geojson: dict,
-        simplify_tolerance: float = 1.0
+        simplify_tolerance: float = 1.0,
+        search_poly: Optional[BaseGeometry] = None,
+        max_vertices: Optional[int] = None
     ) -> dict:
         """
         Build a polygon from a set of visible cells.
 
         Args:
-            cell_ids: Set of cell IDs
+            cell_ids: Cell IDs (sorted int64 array or set)
             search_polygon_geojson: Original search polygon for clipping
             simplify_tolerance: Tolerance for polygon simplification (meters)
+            search_poly: Optional search polygon already parsed and prepared
+                with shapely.prepare (avoids re-parsing it for every segment)
+            max_vertices: Optional cap on the polygon's coordinate count; the
+                simplification tolerance is raised, up to
+                MAX_SIMPLIFY_TOLERANCE_CELLS cells, until the polygon fits
 
         Returns:
             GeoJSON polygon geometry
         """
-        if not cell_ids:
-            return None
-
-        # Get cell polygons
-        cell_polygons = []
+        polygon = self._build_segment_shape(
+            cell_ids,
+            search_polygon_geojson,
+            simplify_tolerance,
+            search_poly=search_poly,
+            max_vertices=max_vertices
+        )
+        return mapping(polygon) if polygon is not None else None
 
-        transform = self.dem_processor.transform
-        cell_width = abs(transform[0])
-        cell_height = abs(transform[4])
+    def _build_segment_shape(
+        self,
+        cell_ids: Iterable[int],
+        search_polygon_geojson: dict,
+        simplify_tolerance: float = 1.0,
+        search_poly: Optional[BaseGeometry] = None,
+        max_vertices: Optional[int] = None
+    ) -> Optional[BaseGeometry]:
+        """
+        Build a segment polygon as a shapely geometry (see build_segment_polygon).
 
-        for cell_id in cell_ids:
-            if cell_id not in self.dem_processor.cell_index:
-                continue
+        Args:
+            cell_ids: Cell IDs (sorted int64 array or set)
+            search_polygon_geojson: Original search polygon for clipping
+            simplify_tolerance: Tolerance for polygon simplification (meters)
+            search_poly: Optional search polygon already parsed and prepared
+                with shapely.prepare (avoids re-parsing it for every segment)
+            max_vertices: Optional cap on the polygon's coordinate count; the
+                simplification tolerance is raised, up to
+                MAX_SIMPLIFY_TOLERANCE_CELLS cells, until the polygon fits
 
-            # Get cell centroid
-            cx, cy = self.dem_processor.cell_index[cell_id]
+        Returns:
+            Shapely polygon, or None if no polygon could be built
+        """
+        if len(cell_ids) == 0:
+            return None
 
-            # Create cell polygon (bounding box)
-            minx = cx - cell_width / 2
-            maxx = cx + cell_width / 2
-            miny = cy - cell_height / 2
-            maxy = cy + cell_height / 2
+        transform = self.dem_processor.transform
+        cell_width = abs(transform[0])
 
-            cell_poly = box(minx, miny, maxx, maxy)
-            cell_polygons.append(cell_poly)
+        # Get cell raster positions (unknown cell IDs are dropped)
+        _, rows, cols = self.dem_processor.get_cell_row_col_arrays(cell_ids)
 
-        if not cell_polygons:
+        if len(rows) == 0:
             return None
 
-        # Union all cell polygons
-        unified_polygon = unary_union(cell_polygons)
+        # The union of the cell boxes is the raster footprint of the cell set,
+        # so rasterize the cells into a mask over their bounding window and
+        # trace its outlines directly instead of merging boxes in GEOS
+        row_off, col_off = rows.min(), cols.min()
+        cell_mask = np.zeros(
+            (rows.max() - row_off + 1, cols.max() - col_off + 1),
+            dtype=np.uint8
+        )
+        cell_mask[rows - row_off, cols - col_off] = 1
+
+        window_transform = transform * Affine.translation(col_off, row_off)
+        unified_polygon = self._trace_cell_mask(cell_mask, window_transform)
 
         # Handle MultiPolygon: use conservative consolidation
         from shapely.geometry import MultiPolygon as ShapelyMultiPolygon
@@ -239,21 +531,21 @@ class PolygonBuilder:
                 f"total area {total_area:.2f} m². Applying conservative consolidation..."
             )
 
-            # Strategy: Small buffer to merge nearby parts that are close together
-            # Use smaller buffer to avoid creating overlaps with other segments
-            buffer_distance = cell_width * 0.3  # Reduced from 0.5 to be more conservative
-
-            # Positive buffer to merge nearby parts
-            buffered = unified_polygon.buffer(buffer_distance)
-
-            # Negative buffer to restore size (slightly smaller negative to smooth edges)
-            consolidated = buffered.buffer(-buffer_distance * 0.9)
+            # Strategy: merge parts that only touch diagonally at a cell corner.
+            # This is what a small buffer/unbuffer of the traced outline did
+            # (parts a whole cell apart stay separate), with the contacts
+            # found on the mask instead of with two GEOS offset curves
+            consolidated = self._bridge_diagonal_contacts(
+                unified_polygon,
+                cell_mask,
+                window_transform
+            )
 
             # Keep result even if it's still MultiPolygon - don't use convex hull
             # as it creates too much overlap
             if isinstance(consolidated, ShapelyMultiPolygon):
                 logger.info(
-                    f"After buffer merge: {len(consolidated.geoms)} parts remain. "
+                    f"After diagonal merge: {len(consolidated.geoms)} parts remain. "
                     f"Keeping MultiPolygon (no convex hull to avoid overlaps)."
                 )
             else:
@@ -262,12 +554,30 @@ class PolygonBuilder:
             unified_polygon = consolidated
 
         # Clip to search polygon
-        from shapely.geometry import shape
-        search_poly = shape(search_polygon_geojson)
-        clipped_polygon = unified_polygon.intersection(search_poly)
+        if search_poly is None:
+            search_poly = shape(search_polygon_geojson)
+            shapely.prepare(search_poly)
+
+        # Compare bounding boxes as plain floats first, so the GEOS predicates
+        # only run when the boxes alone cannot decide
+        sminx, sminy, smaxx, smaxy = search_poly.bounds
+        uminx, uminy, umaxx, umaxy = unified_polygon.bounds
+        bbox_disjoint = uminx > smaxx or umaxx < sminx or uminy > smaxy or umaxy < sminy
+        bbox_inside = uminx >= sminx and umaxx <= smaxx and uminy >= sminy and umaxy <= smaxy
+
+        if bbox_inside and search_poly.contains(unified_polygon.envelope):
+            # Segment lies fully inside the search polygon, nothing to clip
+            clipped_polygon = unified_polygon
+        elif bbox_disjoint or search_poly.disjoint(unified_polygon):
+            logger.warning("Segment polygon lies entirely outside the search polygon")
+            return None
+        else:
+            clipped_polygon = unified_polygon.intersection(search_poly)
 
-        # Conservative consolidation after clipping as well
-        if isinstance(clipped_polygon, ShapelyMultiPolygon):
+        # Conservative consolidation after clipping as well. A segment the
+        # clip left untouched already had its corner contacts bridged above,
+        # and its parts are at least a cell apart, which the buffer cannot bridge
+        if clipped_polygon is not unified_polygon and isinstance(clipped_polygon, ShapelyMultiPolygon):
             num_parts = len(clipped_polygon.geoms)
             total_area = clipped_polygon.area
 
@@ -276,33 +586,68 @@ class PolygonBuilder:
                 f"total area {total_area:.2f} m². Applying conservative consolidation..."
             )
 
-            # Use conservative buffer to merge nearby parts
+            # Use conservative buffer to merge nearby parts. Parts more than
+            # two buffer distances apart cannot meet, so only groups of parts
+            # chained within that distance are buffered; lone parts are kept
+            # exactly as clipped
             buffer_distance = cell_width * 0.3
-            buffered = clipped_polygon.buffer(buffer_distance)
-            consolidated = buffered.buffer(-buffer_distance * 0.9)
+            parts = shapely.get_parts(clipped_polygon)
+            num_groups, labels = self._group_nearby_parts(parts, 2 * buffer_distance)
 
-            # Keep result even if still MultiPolygon - avoid convex hull
-            if isinstance(consolidated, ShapelyMultiPolygon):
-                logger.info(
-                    f"After buffer merge: {len(consolidated.geoms)} parts remain. "
-                    f"Keeping as MultiPolygon."
-                )
+            if num_groups == len(parts):
+                logger.info("Parts are too far apart to merge. Keeping as MultiPolygon.")
             else:
-                logger.info(f"Consolidated into single polygon")
+                merged_parts = []
+                for group in range(num_groups):
+                    group_parts = parts[labels == group]
+                    if len(group_parts) == 1:
+                        merged_parts.append(group_parts[0])
+                        continue
+
+                    buffered = shapely.multipolygons(group_parts).buffer(
+                        buffer_distance, quad_segs=CONSOLIDATION_QUAD_SEGS
+                    )
+                    merged = buffered.buffer(-buffer_distance * 0.9, quad_segs=CONSOLIDATION_QUAD_SEGS)
+                    merged_parts.extend(shapely.get_parts(merged))
 
-            clipped_polygon = consolidated
+                consolidated = (
+                    merged_parts[0] if len(merged_parts) == 1
+                    else shapely.multipolygons(merged_parts)
+                )
 
-        # Simplify to reduce vertex count
-        if simplify_tolerance > 0:
+                # Keep result even if still MultiPolygon - avoid convex hull
+                if isinstance(consolidated, ShapelyMultiPolygon):
+                    logger.info(
+                        f"After buffer merge: {len(consolidated.geoms)} parts remain. "
+                        f"Keeping as MultiPolygon."
+                    )
+                else:
+                    logger.info(f"Consolidated into single polygon")
+
+                clipped_polygon = consolidated
+
+        # Simplify to reduce vertex count. Outlines with at most 8 coordinates
+        # (a rectangle or L of whole cells) have no vertex within tolerance
+        # of its neighbours' chord, so the GEOS pass is skipped for them
+        unsimplified = clipped_polygon
+        if simplify_tolerance > 0 and shapely.get_num_coordinates(clipped_polygon) > 8:
             clipped_polygon = clipped_polygon.simplify(
                 simplify_tolerance,
                 preserve_topology=True
             )
 
+        if max_vertices is not None and shapely.get_num_coordinates(clipped_polygon) > max_vertices:
+            clipped_polygon = self._simplify_to_vertex_budget(
+                unsimplified,
+                max(simplify_tolerance, cell_width * 0.5),
+                max_vertices,
+                cell_width * MAX_SIMPLIFY_TOLERANCE_CELLS
+            )
+
         # Fix invalid geometry if needed
         if not clipped_polygon.is_valid:
             logger.warning("Segment polygon has invalid geometry after clipping/simplification, fixing...")
-            clipped_polygon = clipped_polygon.buffer(0)
+            clipped_polygon = self._make_valid_polygon(clipped_polygon)
 
         # Remove small holes to ensure solid segments
         clipped_polygon = self.remove_holes(clipped_polygon, min_hole_area=100)
@@ -317,8 +662,41 @@ class PolygonBuilder:
             )
             clipped_polygon = self._ensure_single_polygon(clipped_polygon, "final")
 
-        # Convert to GeoJSON
-        return mapping(clipped_polygon)
+        return clipped_polygon
+
+    def _build_segment_chunk(
+        self,
+        segments: List[Dict],
+        search_polygon_geojson: dict,
+        simplify_tolerance: float,
+        max_vertices: Optional[int] = None
+    ) -> List[Optional[BaseGeometry]]:
+        """
+        Build the polygons of a chunk of segments (one thread pool task).
+
+        Args:
+            segments: Segment dictionaries from SegmentGenerator
+            search_polygon_geojson: Search polygon in projected CRS
+            simplify_tolerance: Simplification tolerance
+            max_vertices: Optional cap on each polygon's coordinate count
+
+        Returns:
+            Shapely polygon (or None) per segment, in input order
+        """
+        # Parse and prepare the search polygon once for the whole chunk
+        search_poly = shape(search_polygon_geojson)
+        shapely.prepare(search_poly)
+
+        return [
+            self._build_segment_shape(
+                segment['covered_cells'],
+                search_polygon_geojson,
+                simplify_tolerance,
+                search_poly=search_poly,
+                max_vertices=max_vertices
+            )
+            for segment in segments
+        ]
 
     def build_all_segments(
         self,
@@ -326,7 +704,8 @@ class PolygonBuilder:
         grid_points: List[Tuple[float, float]],
         search_polygon_geojson: dict,
         proj_epsg: int,
-        simplify_tolerance: float = 1.0
+        simplify_tolerance: float = 1.0,
+        max_vertices: Optional[int] = None
     ) -> List[Dict]:
         """
         Build polygons for all segments.
@@ -337,6 +716,11 @@ class PolygonBuilder:
             search_polygon_geojson: Search polygon in projected CRS
             proj_epsg: Projected EPSG code
             simplify_tolerance: Simplification tolerance
+            max_vertices: Optional cap on each segment polygon's coordinate
+                count. It applies to the outlines built from the cells, before
+                overlap removal, small-part merging and gap filling; those
+                steps can add vertices back, and re-simplifying afterwards
+                would open gaps or overlaps between neighbouring segments
 
         Returns:
             List of segment dictionaries with polygon and launch point
@@ -346,56 +730,66 @@ class PolygonBuilder:
         result_segments = []
         total_segments = len(segments)
 
-        for idx, segment in enumerate(segments):
-            # Report progress
-            if self.progress_callback:
-                progress_pct = 85 + int((idx / total_segments) * 4)  # Map to 85-89%
-                self.progress_callback(
-                    f"Building segment polygons... ({idx + 1}/{total_segments})",
-                    progress_pct
-                )
-
-            point_id = segment['point_id']
-            cell_ids = segment['covered_cells']
-
-            # Build polygon
-            polygon_geom = self.build_segment_polygon(
-                cell_ids,
-                search_polygon_geojson,
-                simplify_tolerance
+        # Segment polygons are independent and GEOS releases the GIL, so they
+        # are built on a thread pool. Each task builds a chunk of segments
+        # against its own prepared search polygon, as prepared geometries
+        # must not be shared between threads
+        chunk_size = max(1, math.ceil(total_segments / (SEGMENT_BUILD_WORKERS * 4)))
+        chunks = [
+            segments[start:start + chunk_size]
+            for start in range(0, total_segments, chunk_size)
+        ]
+
+        with ThreadPoolExecutor(max_workers=SEGMENT_BUILD_WORKERS) as executor:
+            chunk_shapes = executor.map(
+                self._build_segment_chunk,
+                chunks,
+                repeat(search_polygon_geojson),
+                repeat(simplify_tolerance),
+                repeat(max_vertices)
+            )
+            built = (
+                (segment, poly_shape)
+                for chunk, shapes_in_chunk in zip(chunks, chunk_shapes)
+                for segment, poly_shape in zip(chunk, shapes_in_chunk)
             )
 
-            if polygon_geom is None:
-                logger.warning(f"Failed to build polygon for segment {segment['sequence']}")
-                continue
+            # Results arrive in segment order
+            for idx, (segment, poly_shape) in enumerate(built):
+                # Report progress
+                if self.progress_callback:
+                    progress_pct = 85 + int((idx / total_segments) * 4)  # Map to 85-89%
+                    self.progress_callback(
+                        f"Building segment polygons... ({idx + 1}/{total_segments})",
+                        progress_pct
+                    )
 
-            # Get launch point coordinates
-            if point_id < len(grid_points):
-                lx, ly = grid_points[point_id]
-            else:
-                logger.error(f"Invalid point_id {point_id}")
-                continue
+                point_id = segment['point_id']
+                cell_ids = segment['covered_cells']
 
-            # Calculate area
-            from shapely.geometry import shape
-            poly_shape = shape(polygon_geom)
-            area_m2 = poly_shape.area
-            area_acres = area_m2 / 4046.86
+                if poly_shape is None:
+                    logger.warning(f"Failed to build polygon for segment {segment['sequence']}")
+                    continue
 
-            # Store segment data
-            result_segment = {
-                'sequence': segment['sequence'],
-                'point_id': point_id,
-                'launch_point': {'x': lx, 'y': ly},
-                'polygon': polygon_geom,
-                'area_m2': area_m2,
-                'area_acres': area_acres,
-                'access_type': segment.get('access_type', 'none'),
-                'cell_count': len(cell_ids),
-                'proj_epsg': proj_epsg
-            }
+                # Get launch point coordinates
+                if point_id < len(grid_points):
+                    lx, ly = grid_points[point_id]
+                else:
+                    logger.error(f"Invalid point_id {point_id}")
+                    continue
+
+                # Store segment data (polygon and areas are set below)
+                result_segment = {
+                    'sequence': segment['sequence'],
+                    'point_id': point_id,
+                    'launch_point': {'x': lx, 'y': ly},
+                    'access_type': segment.get('access_type', 'none'),
+                    'cell_count': len(cell_ids),
+                    'proj_epsg': proj_epsg
+                }
+                self._set_segment_polygon(result_segment, poly_shape)
 
-            result_segments.append(result_segment)
+                result_segments.append(result_segment)
 
         logger.info(f"Successfully built {len(result_segments)} segment polygons")
 
@@ -439,19 +833,45 @@ class PolygonBuilder:
         """
         logger.info("Removing overlaps between segments...")
 
-        from shapely.geometry import shape
-
         processed_segments = []
-        previous_union = None
+        # Polygons of the segments kept so far; their union is what each new
+        # segment must not overlap. The first `indexed` of them are in `tree`,
+        # the rest are pending and found through their bounds
+        processed_polys = []
+        processed_bounds = []
+        tree = None
+        indexed = 0
 
         for idx, segment in enumerate(segments):
-            seg_shape = shape(segment['polygon'])
+            seg_shape = self._segment_shape(segment)
             original_area = seg_shape.area
 
             # If not the first segment, remove overlap with all previous segments
-            if previous_union is not None:
-                # Subtract the union of all previous segments
-                non_overlapping = seg_shape.difference(previous_union)
+            if processed_polys:
+                # Only previous segments whose envelopes meet this one can
+                # overlap it, so subtract just those instead of the union of
+                # every previous segment
+                hits = tree.query(seg_shape).tolist() if tree is not None else []
+                minx, miny, maxx, maxy = seg_shape.bounds
+                hits.extend(
+                    i for i in range(indexed, len(processed_polys))
+                    if processed_bounds[i][0] <= maxx and processed_bounds[i][2] >= minx
+                    and processed_bounds[i][1] <= maxy and processed_bounds[i][3] >= miny
+                )
+                if len(hits) == 0:
+                    non_overlapping = seg_shape
+                else:
+                    previous = shapely.union_all([processed_polys[i] for i in hits])
+                    shapely.prepare(previous)
+
+                    # Cheap prepared predicates settle the untouched and the
+                    # fully covered cases without a GEOS overlay
+                    if previous.disjoint(seg_shape):
+                        non_overlapping = seg_shape
+                    elif previous.contains(seg_shape):
+                        non_overlapping = Polygon()
+                    else:
+                        non_overlapping = seg_shape.difference(previous)
 
                 # Check if we lost significant area
                 new_area = non_overlapping.area
@@ -476,7 +896,7 @@ class PolygonBuilder:
                     # Fix invalid geometry if needed
                     if not non_overlapping.is_valid:
                         logger.warning(f"Segment {segment['sequence']} has invalid geometry after overlap removal, fixing...")
-                        non_overlapping = non_overlapping.buffer(0)
+                        non_overlapping = self._make_valid_polygon(non_overlapping)
 
                     # Remove holes created by overlap removal
                     non_overlapping = self.remove_holes(non_overlapping, min_hole_area=100)
@@ -501,12 +921,11 @@ class PolygonBuilder:
                     # Recalculate area after consolidation
                     new_area = non_overlapping.area
 
-                    segment['polygon'] = mapping(non_overlapping)
-                    segment['area_m2'] = new_area
-                    segment['area_acres'] = new_area / 4046.86
+                    self._set_segment_polygon(segment, non_overlapping)
 
-                    # Update union of processed segments
-                    previous_union = previous_union.union(non_overlapping)
+                    # Update processed segments
+                    processed_polys.append(non_overlapping)
+                    processed_bounds.append(non_overlapping.bounds)
                 else:
                     logger.warning(
                         f"Segment {segment['sequence']} became empty after overlap removal. "
@@ -515,7 +934,13 @@ class PolygonBuilder:
                     continue  # Skip empty segments
             else:
                 # First segment - no overlap to remove
-                previous_union = seg_shape
+                processed_polys.append(seg_shape)
+                processed_bounds.append(seg_shape.bounds)
+
+            # Index the pending polygons once enough have accumulated
+            if len(processed_polys) - indexed >= OVERLAP_INDEX_REBUILD:
+                tree = STRtree(processed_polys)
+                indexed = len(processed_polys)
 
             processed_segments.append(segment)
 
@@ -543,36 +968,33 @@ class PolygonBuilder:
         """
         logger.info("Checking for small disconnected parts to merge into nearest neighbors...")
 
-        from shapely.geometry import shape, MultiPolygon as ShapelyMultiPolygon
+        from shapely.geometry import MultiPolygon as ShapelyMultiPolygon
 
         merge_count = 0
         total_merged_area = 0
 
+        # Current polygon of every segment, kept in step with merges so that
+        # nearest-segment distances are measured in one vectorized call
+        polys = np.array([self._segment_shape(segment) for segment in segments], dtype=object)
+
         # Process each segment
         for i, segment in enumerate(segments):
-            poly = shape(segment['polygon'])
+            poly = polys[i]
 
             # Only process MultiPolygons
             if not isinstance(poly, ShapelyMultiPolygon):
                 continue
 
             # Get all parts sorted by area (largest first)
-            parts_with_area = [(p, p.area) for p in poly.geoms]
-            parts_with_area.sort(key=lambda x: x[1], reverse=True)
+            parts, areas = self._parts_by_area(poly)
 
             total_area = poly.area
-            parts_to_keep = []
-            parts_to_merge = []
-
-            # Classify parts as keep or merge
-            for part, area in parts_with_area:
-                area_ratio = area / total_area if total_area > 0 else 0
+            area_ratios = areas / total_area if total_area > 0 else np.zeros_like(areas)
 
-                # Keep if it meets either threshold
-                if area >= min_part_area or area_ratio >= min_part_ratio:
-                    parts_to_keep.append(part)
-                else:
-                    parts_to_merge.append(part)
+            # Classify parts as keep or merge; keep if it meets either threshold
+            keep = (areas >= min_part_area) | (area_ratios >= min_part_ratio)
+            parts_to_keep = list(parts[keep])
+            parts_to_merge = list(parts[~keep])
 
             # If there are small parts to merge
             if parts_to_merge:
@@ -586,25 +1008,21 @@ class PolygonBuilder:
                     small_part_centroid = small_part.centroid
                     small_part_area = small_part.area
 
-                    # Find nearest segment (excluding current segment)
-                    min_distance = float('inf')
-                    nearest_segment_idx = None
-
-                    for j, other_segment in enumerate(segments):
-                        if i == j:
-                            continue  # Skip self
-
-                        other_poly = shape(other_segment['polygon'])
-                        distance = other_poly.distance(small_part_centroid)
+                    # Find nearest segment (excluding current segment); empty
+                    # polygons have no distance and are never picked
+                    distances = shapely.distance(polys, small_part_centroid)
+                    distances[i] = np.inf
+                    distances[np.isnan(distances)] = np.inf
 
-                        if distance < min_distance:
-                            min_distance = distance
-                            nearest_segment_idx = j
+                    nearest_segment_idx = None
+                    if len(distances) and np.isfinite(distances.min()):
+                        nearest_segment_idx = int(np.argmin(distances))
+                        min_distance = distances[nearest_segment_idx]
 
                     # Merge small part into nearest segment
                     if nearest_segment_idx is not None:
                         nearest_segment = segments[nearest_segment_idx]
-                        nearest_poly = shape(nearest_segment['polygon'])
+                        nearest_poly = polys[nearest_segment_idx]
 
                         # Union the small part with the nearest segment
                         try:
@@ -618,9 +1036,8 @@ class PolygonBuilder:
                                 )
 
                             # Update nearest segment
-                            nearest_segment['polygon'] = mapping(merged_poly)
-                            nearest_segment['area_m2'] = merged_poly.area
-                            nearest_segment['area_acres'] = merged_poly.area / 4046.86
+                            self._set_segment_polygon(nearest_segment, merged_poly)
+                            polys[nearest_segment_idx] = merged_poly
 
                             logger.info(
                                 f"Merged small disconnected part of Segment {segment['sequence']} "
@@ -649,9 +1066,8 @@ class PolygonBuilder:
                         )
                         updated_poly = parts_to_keep[0]
 
-                    segment['polygon'] = mapping(updated_poly)
-                    segment['area_m2'] = updated_poly.area
-                    segment['area_acres'] = updated_poly.area / 4046.86
+                    self._set_segment_polygon(segment, updated_poly)
+                    polys[i] = updated_poly
                 else:
                     # All parts were small and merged away - this shouldn't happen
                     logger.warning(
@@ -685,27 +1101,39 @@ class PolygonBuilder:
         """
         logger.info("Checking for nested segments (islands) to absorb...")
 
-        from shapely.geometry import shape
-
         # Track which segments to remove (they've been absorbed)
         segments_to_remove = set()
         absorption_count = 0
 
+        # Current polygon and bounds of every segment. A segment can only lie
+        # within another if its bounds do, so each outer segment tests just the
+        # segments whose bounds fall inside its own
+        polys = np.array([self._segment_shape(segment) for segment in segments], dtype=object)
+        bounds = shapely.bounds(polys).reshape(-1, 4)
+
         # Check each pair of segments for containment
         for i, seg_outer in enumerate(segments):
             if i in segments_to_remove:
                 continue  # Skip if already marked for removal
 
-            poly_outer = shape(seg_outer['polygon'])
+            poly_outer = polys[i]
+            shapely.prepare(poly_outer)
 
-            for j, seg_inner in enumerate(segments):
+            minx, miny, maxx, maxy = bounds[i]
+            candidates = np.flatnonzero(
+                (bounds[:, 0] >= minx) & (bounds[:, 1] >= miny) &
+                (bounds[:, 2] <= maxx) & (bounds[:, 3] <= maxy)
+            )
+
+            for j in candidates.tolist():
                 if i == j or j in segments_to_remove:
                     continue  # Skip self and already removed segments
 
-                poly_inner = shape(seg_inner['polygon'])
+                seg_inner = segments[j]
+                poly_inner = polys[j]
 
                 # Check if inner segment is completely within outer segment
-                if poly_inner.within(poly_outer) or poly_outer.contains(poly_inner):
+                if poly_outer.contains(poly_inner):
                     # CHANGE: Absorb island by union instead of subtraction
                     logger.info(
                         f"Island detected: Segment {seg_inner['sequence']} "
@@ -742,12 +1170,15 @@ class PolygonBuilder:
                             )
 
                         # Update outer segment
-                        seg_outer['polygon'] = mapping(new_outer)
-                        seg_outer['area_m2'] = new_outer.area
-                        seg_outer['area_acres'] = new_outer.area / 4046.86
+                        self._set_segment_polygon(seg_outer, new_outer)
 
-                        # Update poly_outer for next iteration
+                        # Update poly_outer for next iteration. Absorbing a
+                        # contained segment cannot grow the bounds, so the
+                        # candidate list stays complete
                         poly_outer = new_outer
+                        shapely.prepare(poly_outer)
+                        polys[i] = new_outer
+                        bounds[i] = new_outer.bounds
 
                         # Mark inner segment for removal (it's been absorbed)
                         segments_to_remove.add(j)
@@ -796,8 +1227,7 @@ class PolygonBuilder:
         Returns:
             Updated list of segments with gaps filled
         """
-        from shapely.geometry import shape, MultiPolygon as ShapelyMultiPolygon, Polygon as ShapelyPolygon
-        from shapely.ops import unary_union
+        from shapely.geometry import MultiPolygon as ShapelyMultiPolygon, Polygon as ShapelyPolygon
 
         logger.info("Filling uncovered gaps inside search polygon...")
 
@@ -810,7 +1240,7 @@ class PolygonBuilder:
         search_area = search_poly.area
 
         # Build union of all segment polygons
-        segment_polys = [shape(seg['polygon']) for seg in segments]
+        segment_polys = [self._segment_shape(seg) for seg in segments]
         coverage_union = unary_union(segment_polys)
 
         # Gaps = search area not covered by any segment
@@ -862,7 +1292,7 @@ class PolygonBuilder:
         )
 
         # For distance checks, pre-materialize shapely polygons
-        shapely_segments = [shape(seg['polygon']) for seg in segments]
+        shapely_segments = [self._segment_shape(seg) for seg in segments]
 
         filled_gap_count = 0
         filled_area_total = 0.0
@@ -899,9 +1329,7 @@ class PolygonBuilder:
 
                 # Update segment geometry + cached shapely polygon
                 shapely_segments[nearest_idx] = merged
-                segments[nearest_idx]['polygon'] = mapping(merged)
-                segments[nearest_idx]['area_m2'] = merged.area
-                segments[nearest_idx]['area_acres'] = merged.area / 4046.86
+                self._set_segment_polygon(segments[nearest_idx], merged)
 
                 filled_gap_count += 1
                 filled_area_total += gap_area
@@ -941,14 +1369,14 @@ class PolygonBuilder:
         """
         logger.info("Validating that all segments are single Polygons and no nesting exists...")
 
-        from shapely.geometry import shape, MultiPolygon as ShapelyMultiPolygon
+        from shapely.geometry import MultiPolygon as ShapelyMultiPolygon
 
         multipolygon_count = 0
         fixed_count = 0
 
         # Check 1: Validate polygon types
         for segment in segments:
-            poly = shape(segment['polygon'])
+            poly = self._segment_shape(segment)
 
             # Check geometry type
             if poly.geom_type == 'MultiPolygon' or isinstance(poly, ShapelyMultiPolygon):
@@ -962,9 +1390,7 @@ class PolygonBuilder:
                 poly = self._ensure_single_polygon(poly, f"Segment {segment['sequence']}")
 
                 # Update segment
-                segment['polygon'] = mapping(poly)
-                segment['area_m2'] = poly.area
-                segment['area_acres'] = poly.area / 4046.86
+                self._set_segment_polygon(segment, poly)
                 fixed_count += 1
 
             elif poly.geom_type != 'Polygon':
@@ -986,13 +1412,13 @@ class PolygonBuilder:
         nesting_issues = []
 
         for i, seg_a in enumerate(segments):
-            poly_a = shape(seg_a['polygon'])
+            poly_a = self._segment_shape(seg_a)
 
             for j, seg_b in enumerate(segments):
                 if i == j:
                     continue
 
-                poly_b = shape(seg_b['polygon'])
+                poly_b = self._segment_shape(seg_b)
                 centroid_b = poly_b.centroid
 
                 # Check if segment A contains segment B's centroid
@@ -1035,33 +1461,34 @@ class PolygonBuilder:
 
         logger.info("Transforming segments to WGS84...")
 
-        wgs84_segments = []
-        total_segments = len(segments)
+        if self.progress_callback:
+            self.progress_callback(
+                f"Transforming to WGS84... ({len(segments)} segments)",
+                90
+            )
 
-        for idx, segment in enumerate(segments):
-            # Report progress
-            if self.progress_callback:
-                progress_pct = 90 + int((idx / total_segments) * 4)  # Map to 90-94%
-                self.progress_callback(
-                    f"Transforming to WGS84... ({idx + 1}/{total_segments})",
-                    progress_pct
-                )
+        # Transform all polygons and all launch points with one bulk call each
+        if from_epsg == 4326:
+            polygons_wgs84 = [segment['polygon'] for segment in segments]
+        else:
+            polygons = np.array([self._segment_shape(segment) for segment in segments], dtype=object)
+            polygons_wgs84 = [
+                mapping(polygon)
+                for polygon in CRSManager.transform_geoms(polygons, from_epsg, 4326)
+            ]
 
-            # Transform polygon
-            polygon_wgs84 = CRSManager.transform_geometry(
-                segment['polygon'],
-                from_epsg=from_epsg,
-                to_epsg=4326
-            )
+        lxs = np.array([segment['launch_point']['x'] for segment in segments], dtype=np.float64)
+        lys = np.array([segment['launch_point']['y'] for segment in segments], dtype=np.float64)
+        lxs_wgs84, lys_wgs84 = CRSManager.transform_points(lxs, lys, from_epsg, 4326)
 
-            # Transform launch point
-            lx, ly = segment['launch_point']['x'], segment['launch_point']['y']
-            lx_wgs84, ly_wgs84 = CRSManager.transform_point(
-                lx, ly,
-                from_epsg=from_epsg,
-                to_epsg=4326
-            )
+        wgs84_segments = []
 
+        for segment, polygon_wgs84, lx_wgs84, ly_wgs84 in zip(
+            segments,
+            polygons_wgs84,
+            np.asarray(lxs_wgs84).tolist(),
+            np.asarray(lys_wgs84).tolist()
+        ):
             wgs84_segment = {
                 'sequence': segment['sequence'],
                 'polygon': polygon_wgs84,
@@ -1093,22 +1520,22 @@ class PolygonBuilder:
         Returns:
             Validation results dictionary
         """
-        from shapely.geometry import shape
-        from shapely.ops import unary_union
-
         logger.info("Validating segment coverage...")
 
         search_poly = shape(search_polygon_geojson)
         search_area = search_poly.area
 
+        # Parse every segment polygon once; used for the union and overlaps
+        # (object array so an empty segment list still queries cleanly)
+        polys = np.asarray([shape(seg['polygon']) for seg in segments], dtype=object)
+
         # Union all segment polygons - fix invalid geometries first
         segment_polys = []
-        for seg in segments:
-            poly = shape(seg['polygon'])
-            # Fix invalid geometries using buffer(0)
+        for seg, poly in zip(segments, polys):
+            # Fix invalid geometries
             if not poly.is_valid:
                 logger.warning(f"Segment {seg.get('sequence')} has invalid geometry, fixing...")
-                poly = poly.buffer(0)
+                poly = self._make_valid_polygon(poly)
             segment_polys.append(poly)
 
         try:
@@ -1134,32 +1561,41 @@ class PolygonBuilder:
         gap_area = gaps.area
         gap_percentage = (gap_area / search_area * 100) if search_area > 0 else 0
 
-        # Find overlaps
+        # Total overlap from the union already computed: every overlapping
+        # area is counted once per extra segment covering it
+        overlap_area = max(sum(poly.area for poly in segment_polys) - covered_area.area, 0.0)
+
+        # Find overlapping pairs. An STRtree query returns exactly the pairs
+        # that intersect, which is all the count needs; the intersection
+        # itself is only computed for the pairs reported in detail
+        tree = STRtree(polys)
+        left, right = tree.query(polys, predicate='intersects')
+        upper = left < right
+        pair_order = np.lexsort((right[upper], left[upper]))
+        pairs_i = left[upper][pair_order].tolist()
+        pairs_j = right[upper][pair_order].tolist()
+
         overlaps = []
-        for i, seg1 in enumerate(segments):
-            for j, seg2 in enumerate(segments[i+1:], start=i+1):
-                poly1 = shape(seg1['polygon'])
-                poly2 = shape(seg2['polygon'])
-                overlap = poly1.intersection(poly2)
-                if not overlap.is_empty:
-                    overlaps.append({
-                        'segment1': seg1['sequence'],
-                        'segment2': seg2['sequence'],
-                        'overlap_area_m2': overlap.area
-                    })
+        for i, j in zip(pairs_i[:10], pairs_j[:10]):  # Limit to first 10
+            overlaps.append({
+                'segment1': segments[i]['sequence'],
+                'segment2': segments[j]['sequence'],
+                'overlap_area_m2': polys[i].intersection(polys[j]).area
+            })
 
         validation = {
             'coverage_percentage': coverage_percentage,
             'gap_percentage': gap_percentage,
             'gap_area_m2': gap_area,
-            'overlap_count': len(overlaps),
-            'overlaps': overlaps[:10],  # Limit to first 10
+            'overlap_count': len(pairs_i),
+            'overlap_area_m2': overlap_area,
+            'overlaps': overlaps,
             'is_complete': coverage_percentage >= 99.0
         }
 
         logger.info(
             f"Coverage validation: {coverage_percentage:.2f}% covered, "
-            f"{gap_percentage:.2f}% gaps, {len(overlaps)} overlaps"
+            f"{gap_percentage:.2f}% gaps, {len(pairs_i)} overlaps"
         )
 
         return validation
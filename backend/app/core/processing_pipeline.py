@@ -6,7 +6,9 @@ Orchestrates the entire segment generation workflow.
 import os
 import logging
 from typing import Dict, List
-from shapely.geometry import shape, Point
+import numpy as np
+import shapely
+from shapely.geometry import shape
 
 from .crs_manager import CRSManager
 from .dem_processor import DEMProcessor
@@ -45,6 +47,18 @@ class ProcessingPipeline:
         """
         Execute the full processing pipeline.
 
+        The pipeline steps are blocking; this coroutine is kept for callers that
+        await the pipeline directly. Background workers should call run() instead.
+
+        Returns:
+            Dictionary with results
+        """
+        return self.run()
+
+    def run(self) -> Dict:
+        """
+        Execute the full processing pipeline synchronously.
+
         Returns:
             Dictionary with results
         """
@@ -85,7 +99,6 @@ class ProcessingPipeline:
 
             # Log grid point bounds
             if grid_points:
-                import numpy as np
                 xs = [p[0] for p in grid_points]
                 ys = [p[1] for p in grid_points]
                 logger.info(f"Grid points X range: [{min(xs):.2f}, {max(xs):.2f}]")
@@ -200,10 +213,14 @@ class ProcessingPipeline:
 
     def _setup_crs(self):
         """Setup CRS and transform polygon."""
-        search_polygon = self.config['search_polygon']
+        # Use the polygon parsed at project creation when the caller passed it
+        search_polygon_shape = self.config.get('search_polygon_shape')
 
         # Determine UTM zone and transform
-        utm_epsg, proj_polygon = CRSManager.get_project_crs(search_polygon)
+        if search_polygon_shape is not None:
+            utm_epsg, proj_polygon = CRSManager.get_project_crs_from_shape(search_polygon_shape)
+        else:
+            utm_epsg, proj_polygon = CRSManager.get_project_crs(self.config['search_polygon'])
 
         return utm_epsg, proj_polygon
 
@@ -287,10 +304,8 @@ class ProcessingPipeline:
 
         # Build visibility sets and filter to polygon
         # Prepare polygon once for faster contains checks
-        from shapely.prepared import prep
-        from shapely.geometry import shape
-        geom = shape(proj_polygon)
-        prepared_polygon = prep(geom)
+        prepared_polygon = shape(proj_polygon)
+        shapely.prepare(prepared_polygon)
 
         visibility_sets = {}
         total_viewsheds = len(viewshed_results)
@@ -335,14 +350,15 @@ class ProcessingPipeline:
         dem_processor
     ):
         """Generate segments using greedy algorithm."""
-        # Get all target cells (inside polygon)
-        target_cells = set()
+        # Get all target cells (inside polygon) with one vectorized contains test
         geom = shape(proj_polygon)
+        shapely.prepare(geom)
 
-        for cell_id, (x, y) in dem_processor.cell_index.items():
-            point = Point(x, y)
-            if geom.contains(point):
-                target_cells.add(cell_id)
+        cell_ids, xs, ys = dem_processor.get_cell_coordinate_arrays(
+            dem_processor.valid_cell_ids
+        )
+        inside = shapely.contains_xy(geom, xs, ys)
+        target_cells = set(cell_ids[inside].tolist())
 
         logger.info(f"Target cells within polygon: {len(target_cells)}")
         if target_cells:
@@ -398,7 +414,8 @@ class ProcessingPipeline:
             grid_points,
             proj_polygon,
             utm_epsg,
-            simplify_tolerance=0.5  # Reduced from 2.0 to preserve coverage
+            simplify_tolerance=0.5,  # Reduced from 2.0 to preserve coverage
+            max_vertices=self.config.get('max_segment_vertices')
         )
 
         return segment_polygons
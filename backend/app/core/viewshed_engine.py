@@ -11,8 +11,9 @@ import tempfile
 from typing import List, Tuple, Set
 import numpy as np
 import rasterio
+import shapely
 from osgeo import gdal, gdalconst
-from shapely.geometry import shape, Point
+from shapely.geometry import shape
 import logging
 from concurrent.futures import ProcessPoolExecutor, as_completed
 
@@ -347,27 +348,21 @@ class ViewshedEngine:
         Args:
             visible_cells: Set of cell IDs
             polygon_geojson: Search polygon geometry
-            prepared_polygon: Optional pre-prepared polygon for faster contains checks
+            prepared_polygon: Optional polygon already prepared with shapely.prepare
 
         Returns:
             Filtered set of cell IDs
         """
-        from shapely.prepared import prep
-
         # Use prepared polygon if provided, otherwise create and prepare it
         if prepared_polygon is None:
-            geom = shape(polygon_geojson)
-            prepared_polygon = prep(geom)
-
-        filtered_cells = set()
+            prepared_polygon = shape(polygon_geojson)
+            shapely.prepare(prepared_polygon)
 
-        # Batch process for better performance
-        for cell_id in visible_cells:
-            if cell_id in self.dem_processor.cell_index:
-                x, y = self.dem_processor.cell_index[cell_id]
-                point = Point(x, y)
-                if prepared_polygon.contains(point):
-                    filtered_cells.add(cell_id)
+        # Test all cell centroids in one vectorized call rather than
+        # constructing a Point per cell
+        cell_ids, xs, ys = self.dem_processor.get_cell_coordinate_arrays(visible_cells)
+        inside = shapely.contains_xy(prepared_polygon, xs, ys)
+        filtered_cells = set(cell_ids[inside].tolist())
 
         return filtered_cells
 
@@ -387,13 +382,13 @@ class ViewshedEngine:
             Coverage percentage (0-100)
         """
         geom = shape(polygon_geojson)
+        shapely.prepare(geom)
 
         # Count total cells inside polygon
-        total_cells = 0
-        for cell_id, (x, y) in self.dem_processor.cell_index.items():
-            point = Point(x, y)
-            if geom.contains(point):
-                total_cells += 1
+        _, xs, ys = self.dem_processor.get_cell_coordinate_arrays(
+            self.dem_processor.valid_cell_ids
+        )
+        total_cells = int(np.count_nonzero(shapely.contains_xy(geom, xs, ys)))
 
         if total_cells == 0:
             return 0.0
@@ -9,7 +9,7 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 import os
 
-from app.api.routes import router as api_router
+from app.api.routes import router as api_router, pipeline_executor
 from app.version import VERSION, BUILD_DATE, get_version_info
 
 # Configure logging
@@ -112,6 +112,9 @@ async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down Drone Search Segment Planning Tool API")
 
+    # Drop queued pipelines; running ones finish in their worker threads
+    pipeline_executor.shutdown(wait=False, cancel_futures=True)
+
 
 if __name__ == "__main__":
     import uvicorn
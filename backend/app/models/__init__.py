@@ -5,6 +5,7 @@ Database models for the Drone Search Segment Planning Tool.
 from .project import Project, ProjectCreate, ProjectResponse
 from .segment import SearchSegment, SegmentResponse
 from .grid_point import GridPoint
+from .segment_table import SegmentTable
 
 __all__ = [
     'Project',
@@ -13,4 +14,5 @@ __all__ = [
     'SearchSegment',
     'SegmentResponse',
     'GridPoint',
+    'SegmentTable',
 ]
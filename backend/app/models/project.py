@@ -17,6 +17,11 @@ class ProjectCreate(BaseModel):
     access_types: List[str] = Field(..., description="Access types: road, trail, off_road, anywhere")
     access_deviation_m: float = Field(default=50.0, gt=0, description="Buffer distance for access roads/trails")
     grid_spacing_m: float = Field(default=50.0, gt=0, description="Grid spacing for candidate points")
+    max_segment_vertices: Optional[int] = Field(
+        default=None,
+        ge=4,
+        description="Maximum coordinates per segment outline before overlap removal (None for no limit)"
+    )
 
 
 class ProjectResponse(BaseModel):
@@ -32,6 +37,7 @@ class ProjectResponse(BaseModel):
     access_types: List[str]
     access_deviation_m: float
     grid_spacing_m: float
+    max_segment_vertices: Optional[int] = None
     total_area_acres: Optional[float]
     segment_count: int
     search_polygon: Optional[dict]  # GeoJSON
@@ -0,0 +1,128 @@
+"""
+Columnar storage for generated search segments.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+
+
+@dataclass
+class SegmentTable:
+    """
+    Search segments stored as parallel columns (structure of arrays).
+
+    Scalar fields live in numpy arrays and launch points in a single (N, 2)
+    array, so a project with many segments holds a handful of arrays instead
+    of one dict per segment. Row dicts are only built when a consumer needs
+    them (serialization, KML export).
+
+    Segments without launch point coordinates keep NaN in launch_point and
+    False in has_launch_point; their rows serialize with launch_point None.
+    """
+    sequence: np.ndarray       # (N,) int
+    area_acres: np.ndarray     # (N,) float
+    area_m2: np.ndarray        # (N,) float
+    access_type: List[str]
+    launch_point: np.ndarray   # (N, 2) float, (lon, lat) in WGS84, NaN if missing
+    polygons: List[dict]       # GeoJSON geometries in WGS84
+    has_launch_point: np.ndarray  # (N,) bool
+
+    @classmethod
+    def from_records(cls, segments: List[Dict]) -> 'SegmentTable':
+        """
+        Build a table from a list of segment dictionaries.
+
+        Args:
+            segments: Segment dictionaries as produced by the pipeline (WGS84)
+
+        Returns:
+            SegmentTable with one row per segment
+        """
+        launch_point = np.full((len(segments), 2), np.nan, dtype=np.float64)
+        for idx, seg in enumerate(segments):
+            coordinates = (seg.get('launch_point') or {}).get('coordinates')
+            if coordinates is not None:
+                launch_point[idx] = coordinates[:2]
+
+        return cls(
+            sequence=np.array([seg['sequence'] for seg in segments], dtype=np.int64),
+            area_acres=np.array([seg.get('area_acres', 0) for seg in segments], dtype=np.float64),
+            area_m2=np.array([seg.get('area_m2', 0) for seg in segments], dtype=np.float64),
+            access_type=[seg.get('access_type') for seg in segments],
+            launch_point=launch_point,
+            polygons=[seg['polygon'] for seg in segments],
+            has_launch_point=~np.isnan(launch_point).any(axis=1)
+        )
+
+    def __len__(self) -> int:
+        return len(self.sequence)
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Iterate over segments as row dictionaries."""
+        return iter(self.to_records())
+
+    def _launch_point_geometries(self) -> List[Optional[Dict]]:
+        """GeoJSON Point per row, or None where the launch point is missing."""
+        return [
+            {'type': 'Point', 'coordinates': coordinates} if present else None
+            for coordinates, present in zip(
+                self.launch_point.tolist(),
+                self.has_launch_point.tolist()
+            )
+        ]
+
+    def to_records(self) -> List[Dict]:
+        """
+        Convert the table back to a list of segment dictionaries.
+
+        Returns:
+            List of segment dictionaries (same layout as from_records input)
+        """
+        return [
+            {
+                'sequence': sequence,
+                'polygon': polygon,
+                'launch_point': launch_point,
+                'area_acres': area_acres,
+                'area_m2': area_m2,
+                'access_type': access_type
+            }
+            for sequence, polygon, launch_point, area_acres, area_m2, access_type in zip(
+                self.sequence.tolist(),
+                self.polygons,
+                self._launch_point_geometries(),
+                self.area_acres.tolist(),
+                self.area_m2.tolist(),
+                self.access_type
+            )
+        ]
+
+    def to_feature_collection(self) -> Dict:
+        """
+        Build a GeoJSON FeatureCollection of the segments.
+
+        Returns:
+            GeoJSON FeatureCollection dictionary
+        """
+        return {
+            'type': 'FeatureCollection',
+            'features': [
+                {
+                    'type': 'Feature',
+                    'properties': {
+                        'sequence': sequence,
+                        'area_acres': area_acres,
+                        'access_type': access_type,
+                        'launch_point': launch_point
+                    },
+                    'geometry': polygon
+                }
+                for sequence, area_acres, access_type, launch_point, polygon in zip(
+                    self.sequence.tolist(),
+                    self.area_acres.tolist(),
+                    self.access_type,
+                    self._launch_point_geometries(),
+                    self.polygons
+                )
+            ]
+        }
@@ -83,3 +83,32 @@ def test_calculate_area_acres():
 
     # 1 km² ≈ 247 acres
     assert 200 < area_acres < 300
+
+
+def test_transformer_is_cached():
+    """Test transformers are reused for repeated EPSG pairs."""
+    from app.core.crs_manager import _get_transformer
+
+    assert _get_transformer(4326, 32610) is _get_transformer(4326, 32610)
+
+    # Repeated point transforms give identical results through the cache
+    first = CRSManager.transform_point(-122.4194, 37.7749, 4326, 32610)
+    second = CRSManager.transform_point(-122.4194, 37.7749, 4326, 32610)
+    assert first == second
+
+
+def test_transform_geoms_matches_single_transforms():
+    """Test bulk geometry transform agrees with per-geometry transforms."""
+    import numpy as np
+    from shapely.geometry import Point, mapping, shape
+
+    geoms = np.array(
+        [Point(500000 + i * 1000, 4180000).buffer(200) for i in range(3)],
+        dtype=object
+    )
+
+    transformed = CRSManager.transform_geoms(geoms, 32610, 4326)
+
+    for geom, result in zip(geoms, transformed):
+        expected = shape(CRSManager.transform_geometry(mapping(geom), 32610, 4326))
+        assert result.equals_exact(expected, 1e-9)
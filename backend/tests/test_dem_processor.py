@@ -0,0 +1,78 @@
+"""
+Tests for DEM Processor.
+"""
+import pytest
+import numpy as np
+from affine import Affine
+from rasterio.io import MemoryFile
+from rasterio.mask import mask
+from rasterio.transform import xy
+from shapely.geometry import Polygon, box
+from app.core.dem_processor import DEMProcessor
+
+
+# Small single-band raster of 10 m cells for in-memory datasets
+GTIFF_PROFILE = {
+    'driver': 'GTiff',
+    'width': 20,
+    'height': 16,
+    'count': 1,
+    'dtype': 'float32',
+    'nodata': -9999.0,
+    'transform': Affine(10.0, 0.0, 500000.0, 0.0, -10.0, 4200000.0)
+}
+
+
+def test_cell_coordinate_arrays_match_rasterio():
+    """Test the row-major cell ID decode against rasterio cell centres."""
+    dem = DEMProcessor(None)
+    dem.transform = Affine(10.0, 0.0, 500000.0, 0.0, -10.0, 4200000.0)
+    dem.width = 37
+    dem.height = 23
+
+    cell_ids = np.array([0, 1, 36, 37, 500, dem.num_cells - 1, dem.num_cells, -1])
+    ids, xs, ys = dem.get_cell_coordinate_arrays(cell_ids)
+
+    # Out-of-range IDs are dropped
+    assert ids.tolist() == [0, 1, 36, 37, 500, dem.num_cells - 1]
+
+    rows, cols = np.divmod(ids, dem.width)
+    expected_xs, expected_ys = xy(dem.transform, rows, cols, offset='center')
+
+    np.testing.assert_allclose(xs, expected_xs)
+    np.testing.assert_allclose(ys, expected_ys)
+    assert dem.get_cell_coordinates([37]) == [(expected_xs[3], expected_ys[3])]
+
+
+@pytest.mark.parametrize('geom', [
+    Polygon([(499950, 4199900), (500130, 4199880), (500090, 4200050), (499980, 4200010)]),  # partly outside
+    Polygon([(500012, 4199988), (500153, 4199931), (500071, 4199852)]),                     # fully inside
+    box(500040, 4199860, 500120, 4199940)                                                   # pixel aligned
+], ids=['partly_outside', 'fully_inside', 'pixel_aligned'])
+def test_read_masked_window_matches_rasterio_mask(geom):
+    """Test the windowed read against rasterio.mask.mask with crop=True."""
+    data = np.arange(20 * 16, dtype=np.float32).reshape(1, 16, 20)
+
+    with MemoryFile() as memfile:
+        with memfile.open(**GTIFF_PROFILE) as dataset:
+            dataset.write(data)
+        with memfile.open() as src:
+            out_image, out_transform = DEMProcessor._read_masked_window(src, geom)
+            expected_image, expected_transform = mask(src, [geom], crop=True)
+
+    assert out_transform == expected_transform
+    np.testing.assert_array_equal(out_image, expected_image)
+
+
+def test_read_masked_window_disjoint():
+    """Test that a geometry outside the raster raises like rasterio.mask.mask."""
+    geom = box(501000, 4199000, 501100, 4199100)
+
+    with MemoryFile() as memfile:
+        with memfile.open(**GTIFF_PROFILE) as dataset:
+            dataset.write(np.zeros((1, 16, 20), dtype=np.float32))
+        with memfile.open() as src:
+            with pytest.raises(ValueError, match="Input shapes do not overlap raster"):
+                mask(src, [geom], crop=True)
+            with pytest.raises(ValueError, match="Input shapes do not overlap raster"):
+                DEMProcessor._read_masked_window(src, geom)
@@ -2,6 +2,7 @@
 Tests for Grid Generator.
 """
 import pytest
+import numpy as np
 from app.core.grid_generator import GridGenerator
 
 
@@ -100,3 +101,55 @@ def test_grid_points_inside_polygon():
     for x, y in points:
         point = Point(x, y)
         assert polygon.contains(point) or polygon.boundary.contains(point)
+
+
+def _points_before_dedup(polygon, grid_points, boundary_spacing_m):
+    """Grid points followed by the boundary points add_boundary_points generates."""
+    from shapely.geometry import shape
+
+    boundary = shape(polygon).boundary
+    num_boundary_points = int(boundary.length / boundary_spacing_m)
+    boundary_points = []
+    for i in range(num_boundary_points):
+        point = boundary.interpolate(i / num_boundary_points * boundary.length)
+        boundary_points.append((point.x, point.y))
+    return grid_points + boundary_points
+
+def test_add_boundary_points_dedup():
+    """Test boundary point deduplication against the pairwise greedy loop."""
+    polygon = {
+        'type': 'Polygon',
+        'coordinates': [[
+            [0, 0],
+            [1000, 0],
+            [1000, 600],
+            [0, 600],
+            [0, 0]
+        ]]
+    }
+    boundary_spacing_m = 50.0
+    min_dist = boundary_spacing_m / 2
+
+    # Jittered grid plus exact duplicates and points exactly min_dist apart
+    rng = np.random.default_rng(0)
+    xs, ys = np.meshgrid(np.arange(0, 1001, 20.0), np.arange(0, 601, 20.0))
+    grid_points = list(map(tuple, (
+        np.column_stack([xs.ravel(), ys.ravel()]) + rng.uniform(-8, 8, (xs.size, 2))
+    ).tolist()))
+    grid_points += grid_points[:10] + [(500.0, 300.0), (500.0 + min_dist, 300.0)]
+
+    points = GridGenerator.add_boundary_points(polygon, grid_points, boundary_spacing_m)
+
+    # Reference: keep a point only if no earlier kept point is closer than min_dist
+    expected = []
+    for pt in _points_before_dedup(polygon, grid_points, boundary_spacing_m):
+        if all(np.hypot(pt[0] - kept[0], pt[1] - kept[1]) >= min_dist for kept in expected):
+            expected.append(pt)
+
+    assert points == expected
+
+    coords = np.array(points)
+    dists = np.hypot(*(coords[:, None, :] - coords[None, :, :]).transpose(2, 0, 1))
+    np.fill_diagonal(dists, np.inf)
+    assert dists.min() >= min_dist
+
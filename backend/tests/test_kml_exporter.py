@@ -0,0 +1,159 @@
+"""
+Tests for KML Exporter.
+"""
+import xml.etree.ElementTree as ET
+import pytest
+from app.core.kml_exporter import KMLExporter, SEGMENT_COLORS
+from app.models.segment_table import SegmentTable
+
+
+NS = {'kml': 'http://www.opengis.net/kml/2.2'}
+
+
+def _square(lon, lat, size=0.01):
+    """GeoJSON ring of a square with its lower-left corner at (lon, lat)."""
+    return [[lon, lat], [lon + size, lat], [lon + size, lat + size], [lon, lat + size], [lon, lat]]
+
+
+def _segments():
+    """Segment table with a holed polygon, a MultiPolygon and a missing launch point."""
+    records = [
+        {
+            'sequence': 1,
+            'polygon': {
+                'type': 'Polygon',
+                'coordinates': [_square(-120.0, 38.0), _square(-119.997, 38.003, 0.002)]
+            },
+            'launch_point': {'type': 'Point', 'coordinates': [-120.0, 38.0]},
+            'area_acres': 5.0,
+            'area_m2': 20234.3,
+            'access_type': 'road'
+        },
+        {
+            'sequence': 2,
+            'polygon': {
+                'type': 'MultiPolygon',
+                'coordinates': [[_square(-119.98, 38.0)], [_square(-119.96, 38.0)]]
+            },
+            'launch_point': {'type': 'Point', 'coordinates': [-119.98, 38.0]},
+            'area_acres': 7.0,
+            'area_m2': 28328.0,
+            'access_type': 'anywhere'
+        },
+        {
+            'sequence': len(SEGMENT_COLORS) + 1,
+            'polygon': {'type': 'Polygon', 'coordinates': [_square(-119.94, 38.0)]},
+            'area_acres': 3.0,
+            'area_m2': 12140.6,
+            'access_type': 'road'
+        }
+    ]
+    return SegmentTable.from_records(records)
+
+
+def _export(project_name, segments):
+    """Join the streamed KML and parse it."""
+    exporter = KMLExporter()
+    search_polygon = {'type': 'Polygon', 'coordinates': [_square(-120.1, 37.9, 0.3)]}
+    kml = b''.join(exporter.iter_export(project_name, search_polygon, segments))
+    return ET.fromstring(kml)
+
+
+def _folder(root, name):
+    """Find a top-level folder by name."""
+    for folder in root.iterfind('kml:Document/kml:Folder', NS):
+        if folder.findtext('kml:name', namespaces=NS) == name:
+            return folder
+    raise AssertionError(f"Folder {name} not found")
+
+
+def test_export_parses_with_escaped_name():
+    """Test that the streamed KML is well formed and names are escaped."""
+    name = 'Search <North> & "East"'
+    root = _export(name, _segments())
+
+    assert root.findtext('kml:Document/kml:name', namespaces=NS) == name
+    assert [
+        folder.findtext('kml:name', namespaces=NS)
+        for folder in root.iterfind('kml:Document/kml:Folder', NS)
+    ] == ['Search Boundary', 'Search Segments', 'Launch Points', 'Statistics']
+
+
+def test_export_shared_styles():
+    """Test that every placemark references a style declared once in the document."""
+    root = _export('Test', _segments())
+
+    style_ids = [style.get('id') for style in root.iterfind('kml:Document/kml:Style', NS)]
+    assert len(style_ids) == len(set(style_ids))
+
+    style_urls = [url.text for url in root.iterfind('.//kml:Placemark/kml:styleUrl', NS)]
+    assert style_urls
+    assert all(url.startswith('#') and url[1:] in style_ids for url in style_urls)
+
+    # Segment colors cycle by sequence number
+    segments = _folder(root, 'Search Segments').findall('kml:Placemark', NS)
+    assert [placemark.findtext('kml:styleUrl', namespaces=NS) for placemark in segments] == [
+        '#segment0', '#segment1', '#segment0'
+    ]
+
+
+def test_export_segment_geometry():
+    """Test that segments are exported by outer ring, one polygon per part."""
+    root = _export('Test', _segments())
+    placemarks = _folder(root, 'Search Segments').findall('kml:Placemark', NS)
+
+    # The hole is dropped, only the outer boundary is written
+    holed = placemarks[0]
+    assert holed.findtext('kml:name', namespaces=NS) == 'Segment 1'
+    assert holed.find('.//kml:innerBoundaryIs', NS) is None
+    ring = holed.findtext('kml:Polygon/kml:outerBoundaryIs/kml:LinearRing/kml:coordinates', namespaces=NS)
+    coords = [tuple(map(float, vertex.split(','))) for vertex in ring.split()]
+    assert coords == [(lon, lat, 0.0) for lon, lat in _square(-120.0, 38.0)]
+
+    multi = placemarks[1]
+    assert len(multi.findall('kml:MultiGeometry/kml:Polygon', NS)) == 2
+
+
+def test_export_missing_launch_point():
+    """Test that a segment without a launch point gets no launch placemark."""
+    root = _export('Test', _segments())
+
+    launch_names = [
+        placemark.findtext('kml:name', namespaces=NS)
+        for placemark in _folder(root, 'Launch Points').findall('kml:Placemark', NS)
+    ]
+    assert launch_names == ['Launch Point 1', 'Launch Point 2']
+
+    segment = _folder(root, 'Search Segments').findall('kml:Placemark', NS)[2]
+    assert 'Launch Point: unknown' in segment.findtext('kml:description', namespaces=NS)
+
+    point = _folder(root, 'Statistics').findtext('.//kml:Point/kml:coordinates', namespaces=NS)
+    assert point == '-120.0,38.0,0'
+
+
+def test_export_project_writes_file(tmp_path):
+    """Test that export_project writes the same document as iter_export."""
+    exporter = KMLExporter()
+    segments = _segments()
+    search_polygon = {'type': 'Polygon', 'coordinates': [_square(-120.1, 37.9, 0.3)]}
+    output_path = tmp_path / 'project.kml'
+
+    result = exporter.export_project('A & B', search_polygon, segments, str(output_path))
+
+    assert result == str(output_path)
+    assert output_path.read_bytes() == b''.join(
+        exporter.iter_export('A & B', search_polygon, segments)
+    )
+    root = ET.parse(output_path).getroot()
+    assert root.findtext('kml:Document/kml:name', namespaces=NS) == 'A & B'
+
+
+def test_iter_export_raises_before_streaming():
+    """Test that malformed segments fail when the export is created, not mid-stream."""
+    segments = SegmentTable.from_records([
+        {'sequence': 1, 'polygon': {'type': 'Polygon'}, 'launch_point': None}
+    ])
+    search_polygon = {'type': 'Polygon', 'coordinates': [_square(-120.1, 37.9, 0.3)]}
+
+    with pytest.raises(KeyError):
+        KMLExporter().iter_export('Test', search_polygon, segments)
@@ -0,0 +1,368 @@
+"""
+Tests for Polygon Builder.
+"""
+import pytest
+import numpy as np
+import shapely
+from affine import Affine
+from shapely.geometry import MultiPolygon, Polygon, box, mapping, shape
+from shapely.ops import unary_union
+from app.core.dem_processor import DEMProcessor
+from app.core.polygon_builder import (
+    PolygonBuilder,
+    DIAGONAL_BRIDGE_HALF_WIDTH_CELLS,
+    MAX_SIMPLIFY_TOLERANCE_CELLS,
+    OVERLAP_INDEX_REBUILD
+)
+
+
+# 10 m cells, north-up, in UTM-like coordinates
+TRANSFORM = Affine(10.0, 0.0, 500000.0, 0.0, -10.0, 4200000.0)
+GRID_WIDTH = 40
+GRID_HEIGHT = 30
+
+
+def _dem_grid():
+    """Create a DEMProcessor with a grid but no raster on disk."""
+    dem = DEMProcessor(None)
+    dem.transform = TRANSFORM
+    dem.width = GRID_WIDTH
+    dem.height = GRID_HEIGHT
+    return dem
+
+
+def _cell_box_union(rows, cols, transform=TRANSFORM):
+    """Footprint of cells as the union of one box per cell."""
+    cells = []
+    for row, col in zip(rows, cols):
+        x0, y0 = transform * (col, row)
+        x1, y1 = transform * (col + 1, row + 1)
+        cells.append(box(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)))
+    return unary_union(cells)
+
+
+def _segments(polygons):
+    """Wrap polygons as minimal segment dictionaries."""
+    return [
+        {'sequence': idx + 1, 'polygon': mapping(polygon)}
+        for idx, polygon in enumerate(polygons)
+    ]
+
+
+def test_remove_overlaps_matches_union_difference():
+    """Test overlap removal against differencing the union of all previous segments."""
+    builder = PolygonBuilder(None)
+
+    # A chain of overlapping boxes, long enough to be indexed in the STRtree,
+    # with disjoint boxes and fully covered copies mixed in
+    polygons = []
+    for i in range(OVERLAP_INDEX_REBUILD * 2 + 5):
+        polygons.append(box(i * 80, 0, i * 80 + 100, 100))
+        if i % 7 == 3:
+            polygons.append(box(i * 80, 5000, i * 80 + 60, 5060))  # disjoint
+        if i % 9 == 4:
+            polygons.append(box(i * 80 + 30, 10, i * 80 + 70, 90))  # fully covered
+
+    result = builder._remove_overlaps(_segments(polygons))
+
+    # Reference: difference against the union of everything kept before
+    expected = []
+    previous_union = None
+    for polygon in polygons:
+        remaining = polygon if previous_union is None else polygon.difference(previous_union)
+        if remaining.is_empty:
+            continue
+        expected.append(remaining)
+        previous_union = remaining if previous_union is None else previous_union.union(remaining)
+
+    assert len(result) == len(expected)
+    for segment, reference in zip(result, expected):
+        polygon = shape(segment['polygon'])
+        assert polygon.symmetric_difference(reference).area < 1e-6
+
+
+def test_remove_overlaps_drops_fully_covered_segment():
+    """Test that a segment covered by earlier segments is removed."""
+    builder = PolygonBuilder(None)
+
+    segments = _segments([
+        box(0, 0, 100, 100),
+        box(100, 0, 200, 100),
+        box(50, 20, 150, 80),    # covered by the two boxes together
+        box(1000, 0, 1100, 100)  # disjoint, kept unchanged
+    ])
+
+    result = builder._remove_overlaps(segments)
+
+    assert [segment['sequence'] for segment in result] == [1, 2, 4]
+    assert shape(result[2]['polygon']).equals(box(1000, 0, 1100, 100))
+
+
+def test_trace_cell_mask_matches_box_union_with_hole():
+    """Test tracing a ring of cells against the union of its cell boxes."""
+    cell_mask = np.ones((5, 6), dtype=np.uint8)
+    cell_mask[1:3, 2:4] = 0  # interior hole
+
+    traced = PolygonBuilder._trace_cell_mask(cell_mask, TRANSFORM)
+
+    rows, cols = np.nonzero(cell_mask)
+    expected = _cell_box_union(rows, cols)
+
+    assert traced.geom_type == 'Polygon'
+    assert len(traced.interiors) == 1
+    assert traced.symmetric_difference(expected).area < 1e-6
+
+
+def test_trace_cell_mask_offset_window():
+    """Test tracing a mask whose window starts inside the grid."""
+    cell_mask = np.array([
+        [1, 1, 0, 0],
+        [0, 1, 0, 1],
+        [0, 1, 1, 1]
+    ], dtype=np.uint8)
+    row_off, col_off = 7, 12
+    window_transform = TRANSFORM * Affine.translation(col_off, row_off)
+
+    traced = PolygonBuilder._trace_cell_mask(cell_mask, window_transform)
+
+    rows, cols = np.nonzero(cell_mask)
+    expected = _cell_box_union(rows + row_off, cols + col_off)
+
+    assert traced.is_valid
+    assert traced.symmetric_difference(expected).area < 1e-6
+
+
+def test_build_segment_shape_matches_box_union():
+    """Test building a segment outline from cell IDs, including single cells."""
+    builder = PolygonBuilder(_dem_grid())
+    search = box(*TRANSFORM * (0, GRID_HEIGHT), *TRANSFORM * (GRID_WIDTH, 0))
+
+    # An offset block with a hole, and a single cell
+    block = [(row, col) for row in range(4, 12) for col in range(9, 20)
+             if not (6 <= row < 9 and 12 <= col < 15)]
+    for cells in (block, [(17, 23)]):
+        rows, cols = np.array(cells).T
+        cell_ids = rows * GRID_WIDTH + cols
+
+        polygon = builder._build_segment_shape(
+            cell_ids,
+            mapping(search),
+            simplify_tolerance=0
+        )
+
+        expected = _cell_box_union(rows, cols)
+        assert polygon.geom_type == 'Polygon'
+        assert polygon.symmetric_difference(expected).area < 1e-6
+
+
+def test_bridge_diagonal_contacts_both_diagonals():
+    """Test that blocks touching only at corners become one polygon."""
+    builder = PolygonBuilder(_dem_grid())
+    search = box(*TRANSFORM * (0, GRID_HEIGHT), *TRANSFORM * (GRID_WIDTH, 0))
+    cell_area = abs(TRANSFORM.a * TRANSFORM.e)
+
+    # Falling diagonal (top-left to bottom-right) and rising diagonal contacts
+    falling = [(row, col) for row in range(2, 7) for col in range(2, 7)] + \
+              [(row, col) for row in range(7, 12) for col in range(7, 12)]
+    rising = [(row, col) for row in range(20, 25) for col in range(25, 30)] + \
+             [(row, col) for row in range(15, 20) for col in range(30, 35)]
+
+    for cells in (falling, rising):
+        rows, cols = np.array(cells).T
+        cell_mask = np.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=np.uint8)
+        cell_mask[rows, cols] = 1
+
+        # Traced as is, the blocks only share a corner point
+        assert PolygonBuilder._trace_cell_mask(cell_mask, TRANSFORM).geom_type == 'MultiPolygon'
+
+        polygon = builder._build_segment_shape(
+            rows * GRID_WIDTH + cols,
+            mapping(search),
+            simplify_tolerance=0
+        )
+
+        assert polygon.geom_type == 'Polygon'
+        assert polygon.is_valid
+        assert polygon.covers(_cell_box_union(rows, cols))
+
+        # One contact, bridged by a sliver rather than a whole cell
+        added = polygon.area - len(cells) * cell_area
+        assert 0 < added <= 2 * DIAGONAL_BRIDGE_HALF_WIDTH_CELLS ** 2 * cell_area + 1e-6
+
+
+def test_bridge_diagonal_contacts_area_per_contact():
+    """Test that each corner contact adds a bounded sliver of area."""
+    cell_area = abs(TRANSFORM.a * TRANSFORM.e)
+
+    # A checkerboard: every cell touches its neighbours only at corners
+    cell_mask = (np.add.outer(np.arange(6), np.arange(7)) % 2 == 0).astype(np.uint8)
+    num_contacts = 5 * 6  # one diagonal pair per 2x2 block
+    footprint = PolygonBuilder._trace_cell_mask(cell_mask, TRANSFORM)
+
+    bridged = PolygonBuilder._bridge_diagonal_contacts(footprint, cell_mask, TRANSFORM)
+
+    assert bridged.geom_type == 'Polygon'
+    assert bridged.is_valid
+    assert bridged.covers(footprint)
+
+    added = bridged.area - footprint.area
+    assert added == pytest.approx(num_contacts * 2 * DIAGONAL_BRIDGE_HALF_WIDTH_CELLS ** 2 * cell_area)
+
+    # Cells a whole cell apart stay separate
+    apart = np.array([[1, 0, 1]], dtype=np.uint8)
+    apart_footprint = PolygonBuilder._trace_cell_mask(apart, TRANSFORM)
+    assert PolygonBuilder._bridge_diagonal_contacts(apart_footprint, apart, TRANSFORM) is apart_footprint
+
+
+def test_remove_holes_polygon():
+    """Test hole removal on a Polygon either side of the area threshold."""
+    builder = PolygonBuilder(None)
+    polygon = box(0, 0, 100, 100).difference(box(10, 10, 19, 19)).difference(box(50, 50, 61, 61))
+
+    # 81 m² hole is filled, 121 m² hole is kept
+    result = builder.remove_holes(polygon, min_hole_area=100)
+    assert result.geom_type == 'Polygon'
+    assert len(result.interiors) == 1
+    assert result.area == pytest.approx(10000 - 121)
+
+    # Every hole above the threshold - input returned as is
+    assert builder.remove_holes(polygon, min_hole_area=50) is polygon
+
+    # No hole above the threshold - solid polygon
+    assert builder.remove_holes(polygon, min_hole_area=200).equals(box(0, 0, 100, 100))
+
+
+def test_remove_holes_multipolygon():
+    """Test hole removal on each part of a MultiPolygon."""
+    builder = PolygonBuilder(None)
+    multi = MultiPolygon([
+        box(0, 0, 100, 100).difference(box(10, 10, 19, 19)),    # 81 m² hole
+        box(200, 0, 300, 100).difference(box(210, 10, 221, 21)),  # 121 m² hole
+        box(400, 0, 450, 50)                                      # no holes
+    ])
+
+    result = builder.remove_holes(multi, min_hole_area=100)
+
+    assert result.geom_type == 'MultiPolygon'
+    assert [len(part.interiors) for part in result.geoms] == [0, 1, 0]
+    assert result.area == pytest.approx(10000 + 10000 - 121 + 2500)
+
+    assert builder.remove_holes(multi, min_hole_area=50) is multi
+
+
+def test_remove_holes_empty():
+    """Test hole removal on empty input."""
+    builder = PolygonBuilder(None)
+
+    assert builder.remove_holes(Polygon()).is_empty
+    assert builder.remove_holes(MultiPolygon()).is_empty
+
+
+def test_build_segment_shape_honours_vertex_cap():
+    """Test that segment outlines are simplified down to max_vertices."""
+    builder = PolygonBuilder(_dem_grid())
+    search = box(*TRANSFORM * (0, GRID_HEIGHT), *TRANSFORM * (GRID_WIDTH, 0))
+
+    # A disc of cells has a staircase outline with many vertices
+    rows, cols = np.nonzero(
+        np.hypot(*np.mgrid[-14:15, -14:15]) <= 13.5
+    )
+    cell_ids = (rows + 1) * GRID_WIDTH + (cols + 5)
+
+    uncapped = builder._build_segment_shape(cell_ids, mapping(search), simplify_tolerance=0.5)
+    assert shapely.get_num_coordinates(uncapped) > 40
+
+    for max_vertices in (40, 12):
+        capped = builder._build_segment_shape(
+            cell_ids,
+            mapping(search),
+            simplify_tolerance=0.5,
+            max_vertices=max_vertices
+        )
+        assert shapely.get_num_coordinates(capped) <= max_vertices
+        assert capped.is_valid
+        assert capped.area == pytest.approx(uncapped.area, rel=0.1)
+
+
+def test_simplify_to_vertex_budget_caps_tolerance():
+    """Test that an unreachable budget keeps coverage instead of erasing parts."""
+    cell_width = abs(TRANSFORM.a)
+    max_tolerance = cell_width * MAX_SIMPLIFY_TOLERANCE_CELLS
+
+    # A wavy disc with a one-cell wide arm; the arm would vanish at a
+    # tolerance of a few cells
+    angles = np.linspace(0, 2 * np.pi, 400, endpoint=False)
+    radii = 150 + 3 * np.sin(angles * 40)
+    disc = Polygon(np.column_stack([radii * np.cos(angles), radii * np.sin(angles)]))
+    polygon = disc.union(box(140, -5, 600, 5))
+
+    simplified = PolygonBuilder._simplify_to_vertex_budget(polygon, 5.0, 4, max_tolerance)
+
+    # Over budget, but every result is within the capped tolerance
+    assert shapely.get_num_coordinates(simplified) > 4
+    assert shapely.hausdorff_distance(simplified, polygon) <= max_tolerance + 1e-6
+    assert simplified.intersects(box(590, -5, 600, 5))
+    assert simplified.area == pytest.approx(polygon.area, rel=0.15)
+
+
+def test_simplify_to_vertex_budget_simplifies_input():
+    """Test that each pass simplifies the input polygon, not the previous pass."""
+    angles = np.linspace(0, 2 * np.pi, 400, endpoint=False)
+    radii = 150 + 3 * np.sin(angles * 40)
+    polygon = Polygon(np.column_stack([radii * np.cos(angles), radii * np.sin(angles)]))
+
+    simplified = PolygonBuilder._simplify_to_vertex_budget(polygon, 1.0, 30, 100.0)
+
+    assert shapely.get_num_coordinates(simplified) <= 30
+    candidates = [polygon.simplify(2.0 ** step, preserve_topology=True) for step in range(8)]
+    assert any(simplified.equals_exact(candidate, 0) for candidate in candidates)
+
+
+def test_project_create_default_vertex_cap():
+    """Test that the vertex cap is opt-in."""
+    from app.models.project import ProjectCreate
+
+    project = ProjectCreate(
+        name="Test",
+        search_polygon=mapping(box(0, 0, 1, 1)),
+        drone_agl_altitude=120,
+        preferred_segment_size_acres=100,
+        max_vlos_m=500,
+        access_types=['anywhere']
+    )
+
+    assert project.max_segment_vertices is None
+
+
+def test_validate_coverage_overlaps():
+    """Test overlap area and pairs for two overlapping squares and a disjoint one."""
+    builder = PolygonBuilder(None)
+    segments = _segments([
+        box(0, 0, 100, 100),
+        box(50, 0, 150, 100),   # overlaps the first by 50 x 100
+        box(300, 0, 400, 100)   # disjoint
+    ])
+
+    validation = builder.validate_coverage(segments, mapping(box(0, 0, 400, 100)))
+
+    assert validation['overlap_area_m2'] == pytest.approx(5000)
+    assert validation['overlap_count'] == 1
+    assert validation['overlaps'] == [
+        {'segment1': 1, 'segment2': 2, 'overlap_area_m2': pytest.approx(5000)}
+    ]
+    assert validation['coverage_percentage'] == pytest.approx(62.5)
+    assert validation['gap_area_m2'] == pytest.approx(15000)
+    assert not validation['is_complete']
+
+
+def test_validate_coverage_no_segments():
+    """Test validating an empty segment list."""
+    builder = PolygonBuilder(None)
+
+    validation = builder.validate_coverage([], mapping(box(0, 0, 100, 100)))
+
+    assert validation['overlap_count'] == 0
+    assert validation['overlap_area_m2'] == 0
+    assert validation['overlaps'] == []
+    assert validation['coverage_percentage'] == 0
+    assert validation['gap_area_m2'] == pytest.approx(10000)
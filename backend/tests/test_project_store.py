@@ -0,0 +1,88 @@
+"""
+Tests for the project store.
+"""
+import threading
+import pytest
+from app.api.project_store import ProjectStore
+
+
+def test_get_returns_snapshot():
+    """Test that changing a returned record does not change the store."""
+    store = ProjectStore()
+    record = {'id': 'a', 'status': 'created', 'progress': 0}
+    store.set('a', record)
+
+    # The stored record is a copy of the one passed in
+    record['status'] = 'changed'
+    assert store.get('a')['status'] == 'created'
+
+    snapshot = store.get('a')
+    snapshot['progress'] = 50
+    assert store.get('a')['progress'] == 0
+
+    for snapshot in store.values():
+        snapshot['status'] = 'changed'
+    assert [record['status'] for record in store.values()] == ['created']
+
+    assert store.get('missing') is None
+
+
+def test_update_fields():
+    """Test updating existing and missing records."""
+    store = ProjectStore()
+    store.set('a', {'id': 'a', 'status': 'created', 'progress': 0})
+
+    store.update_fields('a', status='processing', progress=10)
+    assert store.get('a') == {'id': 'a', 'status': 'processing', 'progress': 10}
+
+    # Updating a missing project is a no-op and does not create it
+    store.update_fields('missing', status='processing')
+    assert 'missing' not in store
+    assert len(store) == 1
+
+
+def test_delete():
+    """Test deleting existing and missing records."""
+    store = ProjectStore()
+    store.set('a', {'id': 'a'})
+    store.set('b', {'id': 'b'})
+
+    store.delete('a')
+    store.delete('missing')
+
+    assert 'a' not in store
+    assert store.get('a') is None
+    assert [record['id'] for record in store.values()] == ['b']
+
+    # Updates after delete do not bring the record back
+    store.update_fields('a', status='completed')
+    assert 'a' not in store
+
+
+def test_concurrent_update_fields():
+    """Test that updates from many threads are all applied."""
+    store = ProjectStore()
+    store.set('a', {'id': 'a'})
+    num_threads = 8
+    num_updates = 500
+    start = threading.Barrier(num_threads)
+    stale_reads = []
+
+    def worker(idx):
+        start.wait()
+        for step in range(num_updates):
+            store.update_fields('a', **{f"field{idx}": step})
+            if store.get('a')[f"field{idx}"] != step:
+                stale_reads.append((idx, step))
+
+    threads = [threading.Thread(target=worker, args=(idx,)) for idx in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stale_reads == []
+    assert store.get('a') == {
+        'id': 'a',
+        **{f"field{idx}": num_updates - 1 for idx in range(num_threads)}
+    }
@@ -0,0 +1,27 @@
+"""
+Tests for API route helpers.
+"""
+import pytest
+from urllib.parse import unquote
+from app.api.routes import _attachment_disposition
+
+
+@pytest.mark.parametrize('filename', [
+    'Search.kml',
+    'Café "North"; Ridge.kml',
+    '搜索区域.kml'
+])
+def test_attachment_disposition(filename):
+    """Test that any project name gives an encodable, parseable header."""
+    header = _attachment_disposition(filename)
+
+    # Starlette encodes header values as latin-1
+    header.encode('latin-1')
+
+    disposition, fallback, encoded = header.split('; ')
+    assert disposition == 'attachment'
+    assert fallback.startswith('filename="') and fallback.endswith('"')
+    assert '"' not in fallback[len('filename="'):-1]
+    assert fallback.isascii()
+    assert encoded.startswith("filename*=utf-8''")
+    assert unquote(encoded[len("filename*=utf-8''"):]) == filename
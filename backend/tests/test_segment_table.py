@@ -0,0 +1,77 @@
+"""
+Tests for the columnar segment table.
+"""
+import pytest
+import numpy as np
+from app.models.segment_table import SegmentTable
+
+
+def _record(sequence, launch_point=None):
+    """Create a segment dictionary in the pipeline's WGS84 layout."""
+    lon = -120.0 + sequence * 0.01
+    record = {
+        'sequence': sequence,
+        'polygon': {
+            'type': 'Polygon',
+            'coordinates': [[[lon, 38.0], [lon + 0.01, 38.0], [lon + 0.01, 38.01], [lon, 38.0]]]
+        },
+        'launch_point': launch_point,
+        'area_acres': 10.0 * sequence,
+        'area_m2': 40468.6 * sequence,
+        'access_type': 'road'
+    }
+    return record
+
+
+def test_round_trip():
+    """Test that to_records returns what from_records was given."""
+    records = [
+        _record(1, {'type': 'Point', 'coordinates': [-119.99, 38.005]}),
+        _record(2, {'type': 'Point', 'coordinates': [-119.98, 38.005]})
+    ]
+
+    table = SegmentTable.from_records(records)
+
+    assert len(table) == 2
+    assert table.launch_point.shape == (2, 2)
+    assert table.has_launch_point.tolist() == [True, True]
+    assert table.to_records() == records
+    assert SegmentTable.from_records(table.to_records()).to_records() == records
+
+
+def test_missing_launch_point():
+    """Test segments without launch point coordinates."""
+    records = [
+        _record(1, {'type': 'Point', 'coordinates': [-119.99, 38.005]}),
+        _record(2, None),
+        _record(3, {'type': 'Point'})
+    ]
+    del records[1]['launch_point']
+
+    table = SegmentTable.from_records(records)
+
+    assert table.has_launch_point.tolist() == [True, False, False]
+    assert np.isnan(table.launch_point[1:]).all()
+    assert table.launch_point[0].tolist() == [-119.99, 38.005]
+
+    # Missing launch points come back as None and survive another round trip
+    result = table.to_records()
+    assert [record['launch_point'] for record in result] == [
+        {'type': 'Point', 'coordinates': [-119.99, 38.005]}, None, None
+    ]
+    assert SegmentTable.from_records(result).to_records() == result
+
+    features = table.to_feature_collection()['features']
+    assert [feature['properties']['launch_point'] for feature in features] == [
+        {'type': 'Point', 'coordinates': [-119.99, 38.005]}, None, None
+    ]
+
+
+def test_empty():
+    """Test a table with no segments."""
+    table = SegmentTable.from_records([])
+
+    assert len(table) == 0
+    assert table.launch_point.shape == (0, 2)
+    assert table.to_records() == []
+    assert table.to_feature_collection() == {'type': 'FeatureCollection', 'features': []}